@@ -0,0 +1,101 @@
+"""Time to decode an events payload into Event entities, per 10k events.
+
+    python benchmarks/decode_events.py [--events N] [--repeat N]
+
+'dict mapping' is the field-by-field mapping girok used before typed decoding, kept here as the baseline.
+"""
+
+import argparse
+import json
+import time
+
+from girok.api.schema import EVENT, EVENTS_BODY
+from girok.commands.task.entity import Category, Event, EventDate, Repetition
+from girok.utils.json_utils import iter_json_array
+
+
+def build_payload(num_events: int) -> bytes:
+    events = []
+    for i in range(num_events):
+        events.append(
+            {
+                "id": i,
+                "name": f"Task {i}",
+                "color": "GREYISH_GREEN",
+                "tags": ["work", "urgent"] if i % 2 else [],
+                "priority": "HIGH" if i % 3 == 0 else None,
+                "memo": "Lorem ipsum dolor sit amet" if i % 4 == 0 else None,
+                "eventDate": {
+                    "startDate": "2024-03-01",
+                    "startTime": "09:30" if i % 2 else None,
+                    "endDate": "2024-03-02" if i % 5 == 0 else None,
+                    "endTime": None,
+                },
+                "repetition": {"repetitionType": None, "repetitionEndDate": None},
+                "categoryPath": [{"categoryId": 1, "categoryName": "Work"}, {"categoryId": 2, "categoryName": "Girok"}],
+            }
+        )
+    return json.dumps({"events": events}).encode()
+
+
+def decode_by_dict_mapping(payload: bytes) -> list:
+    events = json.loads(payload)["events"]
+    return [
+        Event(
+            id=event["id"],
+            name=event["name"],
+            color_str=event["color"],
+            tags=event["tags"],
+            priority=event["priority"],
+            memo=event["memo"],
+            event_date=EventDate(
+                start_date=event["eventDate"]["startDate"],
+                start_time=event["eventDate"]["startTime"],
+                end_date=event["eventDate"]["endDate"],
+                end_time=event["eventDate"]["endTime"],
+            ),
+            repetition=Repetition(
+                repetition_type=event["repetition"]["repetitionType"],
+                repetition_end_date=event["repetition"]["repetitionEndDate"],
+            ),
+            category_path=[Category(id=c["categoryId"], name=c["categoryName"]) for c in event["categoryPath"]],
+        )
+        for event in events
+    ]
+
+
+def decode_by_schema(payload: bytes) -> list:
+    return EVENTS_BODY.decode(json.loads(payload))["events"]
+
+
+def decode_by_schema_streamed(payload: bytes) -> list:
+    chunks = (payload[i : i + 64 * 1024] for i in range(0, len(payload), 64 * 1024))
+    return list(EVENT.iter_decode(iter_json_array(chunks, "events")))
+
+
+def measure(decode, payload: bytes, num_events: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(payload)
+        best = min(best, time.perf_counter() - start)
+    return best / num_events * 10_000 * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    payload = build_payload(args.events)
+    for label, decode in [
+        ("dict mapping", decode_by_dict_mapping),
+        ("schema", decode_by_schema),
+        ("schema, streamed", decode_by_schema_streamed),
+    ]:
+        print(f"{label:<20} {measure(decode, payload, args.events, args.repeat):8.2f} ms / 10k events")
+
+
+if __name__ == "__main__":
+    main()
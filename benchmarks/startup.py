@@ -0,0 +1,248 @@
+"""Startup time of the `girok` entry point (girok.daemon.client:main).
+
+    python benchmarks/startup.py [--runs N] [--output FILE] [--check]
+
+Every command runs in a fresh interpreter against an empty config directory, so it stops right after the login
+check and never reaches the network. What's measured is the cost of getting there, in two modes:
+
+- local: no daemon is running, so the client imports girok.girok and runs the command itself (interpreter
+  start, imports and command resolution).
+- daemon: a daemon (`python -m girok.daemon.server`) is running, so commands it serves are forwarded to it and
+  the client only pays for interpreter start, its own stdlib imports and the round trip. Commands it doesn't
+  serve (cal) still run locally.
+
+The client's stdout is a pseudo-terminal, because piped output is never forwarded. Each mode uses its own
+XDG_RUNTIME_DIR, so a daemon the user already runs is neither used nor disturbed.
+
+- cold: the first run with an empty bytecode cache (PYTHONPYCACHEPREFIX pointing to a new directory).
+- warm: the following runs, reusing that bytecode cache.
+
+Per-module import cost comes from `-X importtime` of a warm run, and covers the client process only. Results
+are written to benchmarks/startup_results.json under "<command>" for the local mode and "<command> (daemon)"
+for the daemon mode. `--check` compares them with benchmarks/startup_budget.json and exits with status 1 on
+any violation.
+"""
+
+import argparse
+import json
+import os
+import platform
+import pty
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "startup_results.json")
+BUDGET_PATH = os.path.join(BENCHMARK_DIR, "startup_budget.json")
+
+sys.path.insert(0, REPO_DIR)
+from girok.daemon.protocol import get_socket_path, recv_message, send_message  # noqa: E402
+
+COMMANDS = {
+    "version": ["version"],
+    "showtask": ["showtask"],
+    "showcat": ["showcat"],
+    "cal --help": ["cal", "--help"],
+}
+MODES = ("local", "daemon")
+TOP_IMPORTS = 15
+DAEMON_START_TIMEOUT = 30  # seconds
+
+
+def build_env(pycache_dir: str, config_dir: str, runtime_dir: str) -> dict:
+    env = dict(os.environ, XDG_CONFIG_HOME=config_dir, XDG_RUNTIME_DIR=runtime_dir, PYTHONPATH=REPO_DIR)
+    env["PYTHONPYCACHEPREFIX"] = pycache_dir
+    # Warm runs rely on the bytecode written by the cold run
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def run_command(args: list, env: dict, importtime: bool = False) -> tuple:
+    code = f"import sys; sys.argv[1:] = {args!r}; from girok.daemon.client import main; main()"
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", code]
+
+    # The client only forwards to the daemon when stdout is a terminal. The other end is drained, so that
+    # output never blocks on a full pty buffer.
+    master_fd, slave_fd = pty.openpty()
+    drain = threading.Thread(target=drain_pty, args=(master_fd,), daemon=True)
+    drain.start()
+    try:
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, env=env, stdin=slave_fd, stdout=slave_fd, stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.close(slave_fd)
+        drain.join()
+        os.close(master_fd)
+    return elapsed, proc
+
+
+def drain_pty(master_fd: int) -> None:
+    try:
+        while os.read(master_fd, 65536):
+            pass
+    except OSError:  # EIO once the slave side is closed
+        pass
+
+
+def request_daemon(env: dict, command: str):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(os.path.join(env["XDG_RUNTIME_DIR"], os.path.basename(get_socket_path())))
+        send_message(sock, {"command": command})
+        return recv_message(sock)[0]
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def start_daemon(env: dict) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "girok.daemon.server"],
+        env=dict(env, FORCE_COLOR="1"),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while request_daemon(env, "status") is None:
+        if proc.poll() is not None or time.monotonic() > deadline:
+            stop_daemon(env, proc)
+            raise RuntimeError("The girok daemon didn't start")
+        time.sleep(0.05)
+    return proc
+
+
+def stop_daemon(env: dict, proc: subprocess.Popen) -> None:
+    if request_daemon(env, "stop") is None:
+        proc.terminate()
+    proc.wait()
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth) tuples."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cumulative_us, name = line.split("|")
+        self_us = int(head.split(":")[1])
+        # Top-level imports are indented by one space, and every nesting level adds two
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), self_us, int(cumulative_us), depth))
+    return imports
+
+
+def measure_command(args: list, runs: int, env: dict) -> dict:
+    cold_seconds, proc = run_command(args, env)
+    warm_seconds = [run_command(args, env)[0] for _ in range(runs)]
+    _, importtime_proc = run_command(args, env, importtime=True)
+
+    imports = parse_importtime(importtime_proc.stderr)
+    top_imports = sorted(imports, key=lambda i: i[1], reverse=True)[:TOP_IMPORTS]
+    return {
+        "exit_code": proc.returncode,
+        "cold_ms": round(cold_seconds * 1000, 1),
+        "warm_ms": {
+            "median": round(statistics.median(warm_seconds) * 1000, 1),
+            "min": round(min(warm_seconds) * 1000, 1),
+        },
+        "import_ms": round(sum(i[2] for i in imports if i[3] == 0) / 1000, 1),
+        "modules": sorted(i[0] for i in imports),
+        "top_imports": [
+            {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)}
+            for name, self_us, cumulative_us, _ in top_imports
+        ],
+        "girok_imports": [
+            {"module": name, "cumulative_ms": round(cumulative_us / 1000, 2)}
+            for name, _, cumulative_us, _ in imports
+            if name.startswith("girok")
+        ],
+    }
+
+
+def measure_mode(mode: str, args: list, runs: int) -> dict:
+    """Measure a command with a new bytecode cache and config directory, and in daemon mode a new daemon, so
+    that the cold run is cold for the client and nothing carries over between commands."""
+    with tempfile.TemporaryDirectory() as pycache_dir, tempfile.TemporaryDirectory() as config_dir, \
+            tempfile.TemporaryDirectory() as runtime_dir:
+        env = build_env(pycache_dir, config_dir, runtime_dir)
+        if mode == "local":
+            return measure_command(args, runs, env)
+
+        daemon = start_daemon(env)
+        try:
+            return measure_command(args, runs, env)
+        finally:
+            stop_daemon(env, daemon)
+
+
+def check_budget(results: dict, budget: dict) -> list:
+    violations = []
+    for command, limits in budget.items():
+        result = results["commands"].get(command)
+        if result is None:
+            continue
+
+        modules = result["modules"]
+        if "max_modules" in limits and len(modules) > limits["max_modules"]:
+            violations.append(f"{command}: {len(modules)} modules imported, budget is {limits['max_modules']}")
+        if "max_warm_ms" in limits and result["warm_ms"]["median"] > limits["max_warm_ms"]:
+            violations.append(
+                f"{command}: warm startup {result['warm_ms']['median']} ms, budget is {limits['max_warm_ms']} ms"
+            )
+        for forbidden in limits.get("forbidden_modules", []):
+            if any(m == forbidden or m.startswith(forbidden + ".") for m in modules):
+                violations.append(f"{command}: imports '{forbidden}'")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10, help="Number of warm runs per command")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--check", action="store_true", help=f"Fail if results exceed {BUDGET_PATH}")
+    args = parser.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "commands": {},
+    }
+    for mode in MODES:
+        for command, command_args in COMMANDS.items():
+            name = command if mode == "local" else f"{command} (daemon)"
+            result = measure_mode(mode, command_args, args.runs)
+            results["commands"][name] = result
+            print(
+                f"{name:<21} cold {result['cold_ms']:7.1f} ms  warm {result['warm_ms']['median']:7.1f} ms  "
+                f"imports {result['import_ms']:7.1f} ms  modules {len(result['modules']):4d}"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+    if args.check:
+        with open(BUDGET_PATH) as f:
+            budget = json.load(f)
+        violations = check_budget(results, budget)
+        for violation in violations:
+            print(f"[budget] {violation}")
+        if violations:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from typing import Optional
+
+import girok.api.category as category_api
+from girok.api.entity import APIResponse
+from girok.api_client import AsyncAPIClient
+
+
+async def get_all_categories() -> APIResponse:
+    return await AsyncAPIClient.run(category_api.get_all_categories)
+
+
+async def create_category(category_path: str, color: str) -> APIResponse:
+    return await AsyncAPIClient.run(category_api.create_category, category_path, color)
+
+
+async def remove_category(category_path: str) -> APIResponse:
+    return await AsyncAPIClient.run(category_api.remove_category, category_path)
+
+
+async def update_category(
+    category_path: str, new_name: Optional[str] = None, new_color: Optional[str] = None
+) -> APIResponse:
+    return await AsyncAPIClient.run(category_api.update_category, category_path, new_name, new_color)
+
+
+async def move_category(path: str, new_parent_path: str) -> APIResponse:
+    return await AsyncAPIClient.run(category_api.move_category, path, new_parent_path)
+
+
+async def get_category_id_by_path(path_list: list[str]) -> APIResponse:
+    return await AsyncAPIClient.run(category_api.get_category_id_by_path, path_list)
@@ -0,0 +1,27 @@
+import girok.api.task as task_api
+from girok.api.entity import APIResponse
+from girok.api_client import AsyncAPIClient
+
+
+async def create_task(*args, **kwargs) -> APIResponse:
+    return await AsyncAPIClient.run(task_api.create_task, *args, **kwargs)
+
+
+async def update_task(*args, **kwargs) -> APIResponse:
+    return await AsyncAPIClient.run(task_api.update_task, *args, **kwargs)
+
+
+async def get_single_event(event_id: int) -> APIResponse:
+    return await AsyncAPIClient.run(task_api.get_single_event, event_id)
+
+
+async def get_all_tasks(*args, **kwargs) -> APIResponse:
+    return await AsyncAPIClient.run(task_api.get_all_tasks, *args, **kwargs)
+
+
+async def remove_event(event_id: int) -> APIResponse:
+    return await AsyncAPIClient.run(task_api.remove_event, event_id)
+
+
+async def get_all_tags() -> APIResponse:
+    return await AsyncAPIClient.run(task_api.get_all_tags)
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, TypeVar
+
+from girok.api.entity import APIResponse
+from girok.api.rate_limiter import TokenBucket
+from girok.api_client import APIClient
+from girok.constants import API_BULK_BURST, API_BULK_MAX_WORKERS, API_BULK_RATE, API_POOL_MAXSIZE
+
+T = TypeVar("T")
+
+
+class BulkExecutor:
+    """Runs many API calls concurrently without overwhelming the server.
+
+    At most `max_workers` calls are in flight at once, which never exceeds APIClient's connection pool, and
+    every HTTP request they send (retries included) goes through a shared TokenBucket. The bucket slows down
+    on its own when the server answers 429 / 503, so callers get the highest throughput the server accepts.
+
+    Example:
+        results = BulkExecutor().map(task_api.remove_event, event_ids)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = API_BULK_MAX_WORKERS,
+        rate: float = API_BULK_RATE,
+        burst: float = API_BULK_BURST,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        self.max_workers = min(max_workers, API_POOL_MAXSIZE)
+        self.rate_limiter = TokenBucket(rate=rate, capacity=burst)
+
+    def map(self, func: Callable[[T], APIResponse], items: Iterable[T]) -> List[APIResponse]:
+        """Call `func` on every item and return the responses in the order of `items`.
+
+        Args:
+            func (Callable[[T], APIResponse]): An API function, e.g. `girok.api.task.remove_event`.
+            items (Iterable[T]): Argument of every call.
+
+        Returns:
+            List[APIResponse]: One response per item. A failed call doesn't stop the others.
+        """
+        previous_rate_limiter = APIClient.rate_limiter
+        APIClient.rate_limiter = self.rate_limiter
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="girok-bulk") as executor:
+                return list(executor.map(func, items))
+        finally:
+            APIClient.rate_limiter = previous_rate_limiter
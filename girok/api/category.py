@@ -1,137 +1,210 @@
-from typing import Optional
-from urllib.parse import urljoin
+import fnmatch
+import functools
+from typing import Callable, List, Optional, Tuple
+
+from girok.api.category_index import CategoryIndex
+from girok.api.category_tree import (
+    add_category_node,
+    move_category_node,
+    patch_cached_categories,
+    remove_category_node,
+    update_category_node,
+)
+from girok.api.entity import APIResponse, CategoryNode
+from girok.api.response_cache import ResponseCache
+from girok.api.schema import CATEGORIES_BODY, CATEGORY_ID_BODY, CREATED_CATEGORY_BODY, decode_body
+from girok.api_client import APIClient
 
-import requests
-from requests import HTTPError
 
-from girok.api.entity import APIResponse
-from girok.config.auth_handler import AuthHandler
-from girok.constants import BASE_URL
+def get_all_categories() -> APIResponse:
+    resp = APIClient.get("categories", error_message="Failed to get categories", cache=True)
+    return decode_body(resp, CATEGORIES_BODY)
 
 
-def get_all_categories() -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-    resp = requests.get(
-        url=urljoin(BASE_URL, "categories"),
-        headers={"Authorization": "Bearer " + access_token},
-    )
+def resolve_again_on_stale_index(func: Callable[..., APIResponse]) -> Callable[..., APIResponse]:
+    """Run a category-scoped call once more when the server doesn't know a category id.
 
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError as e:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to get categories"
+    The id most likely came from an outdated CategoryIndex (the category was removed or moved from another
+    device), so the cached tree is dropped and the second run resolves paths from a fresh one.
+    """
 
-        return APIResponse(is_success=False, error_message=error_message)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> APIResponse:
+        resp = func(*args, **kwargs)
+        if not resp.is_success and resp.error_code == "CATEGORY_NOT_FOUND":
+            ResponseCache.invalidate("categories")
+            resp = func(*args, **kwargs)
+        return resp
 
+    return wrapper
 
-def create_category(category_path: str, color: str) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
 
+@resolve_again_on_stale_index
+def create_category(category_path: str, color: str) -> APIResponse:
     category_path_list = category_path.split("/")
     new_category_name = category_path_list[-1]
 
     # Resolve parent category's id
     parent_category_id_resp = get_category_id_by_path(category_path_list[:-1])
     if not parent_category_id_resp.is_success:
-        return APIResponse(is_success=False, error_message=parent_category_id_resp.error_message)
+        return parent_category_id_resp
 
     parent_category_id = parent_category_id_resp.body["categoryId"]
-    resp = requests.post(
-        url=urljoin(BASE_URL, "categories"),
-        headers={"Authorization": "Bearer " + access_token},
+    resp = APIClient.post(
+        "categories",
         json={"parentId": parent_category_id, "name": new_category_name, "color": color},
+        error_message="Failed to create a new category",
     )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_code = error_body["errorCode"]
-            error_message = error_body["message"]
-
-            if error_code == "DUPLICATE_CATEGORY":
-                parent_category_path_str = (
-                    "/" if not category_path_list[:-1] else "/".join(category_path_list[:-1]) + "/"
-                )
-                error_message = f"Duplicate Category: '{parent_category_path_str}' already has '{new_category_name}'"
-        except:
-            error_message = "Failed to create a new category"
-
-        return APIResponse(is_success=False, error_message=error_message)
-
-
+    created_resp = decode_body(resp, CREATED_CATEGORY_BODY)
+    if created_resp.is_success:
+        patch_cached_categories(add_category_node(created_resp.body["categoryId"], category_path_list, color))
+    else:
+        ResponseCache.invalidate("categories")
+
+    if not resp.is_success and resp.error_code == "DUPLICATE_CATEGORY":
+        parent_category_path_str = "/" if not category_path_list[:-1] else "/".join(category_path_list[:-1]) + "/"
+        error_message = f"Duplicate Category: '{parent_category_path_str}' already has '{new_category_name}'"
+        return APIResponse(is_success=False, error_message=error_message, error_code=resp.error_code)
+
+    return resp
+
+
+def create_missing_categories(
+    path_list: List[str], root_categories: List[CategoryNode], color: Optional[str]
+) -> APIResponse:
+    """Create every category of `path_list` that isn't in `root_categories` yet, top-down, like `mkdir -p`.
+
+    Each new category is created under the id returned for its parent, so no path is looked up.
+
+    Args:
+        path_list (List[str]): Full path of the deepest category, e.g. ['School', '2026', 'Fall'].
+        root_categories (List[CategoryNode]): Snapshot of the tree the missing categories are worked out from.
+        color (Optional[str]): Color of the top-level category, if it is one of the missing ones.
+
+    Returns:
+        APIResponse: body["created"] lists the paths of the created categories, also when a later one failed.
+    """
+    parent, existing_depth = find_deepest_category(root_categories, path_list)
+    parent_id = parent.id if parent is not None else None
+
+    created = []
+    for depth in range(existing_depth, len(path_list)):
+        category_color = color if depth == 0 else None
+        resp = APIClient.post(
+            "categories",
+            json={"parentId": parent_id, "name": path_list[depth], "color": category_color},
+            error_message="Failed to create a new category",
+        )
+        created_resp = decode_body(resp, CREATED_CATEGORY_BODY)
+        if not created_resp.is_success:
+            ResponseCache.invalidate("categories")
+            return APIResponse(
+                is_success=False,
+                body={"created": created},
+                error_message=created_resp.error_message,
+                error_code=created_resp.error_code,
+            )
+
+        parent_id = created_resp.body["categoryId"]
+        patch_cached_categories(add_category_node(parent_id, path_list[: depth + 1], category_color))
+        created.append("/".join(path_list[: depth + 1]))
+
+    return APIResponse(is_success=True, body={"created": created})
+
+
+def find_deepest_category(
+    root_categories: List[CategoryNode], path_list: List[str]
+) -> Tuple[Optional[CategoryNode], int]:
+    """Return the deepest existing category along `path_list` and its depth (0 if not even the top one exists)."""
+    category = None
+    children = root_categories
+    for depth, name in enumerate(path_list):
+        child = next((c for c in children if c.name == name), None)
+        if child is None:
+            return category, depth
+        category, children = child, child.children
+    return category, len(path_list)
+
+
+def match_category_paths(root_categories: List[CategoryNode], pattern: str) -> List[Tuple[str, CategoryNode]]:
+    """Find the categories whose path matches `pattern`, e.g. 'Archive/2023/*' or 'School/*/Exams'.
+
+    The pattern is matched level by level with fnmatch rules, so a wildcard never spans a '/' and a path without
+    wildcards matches at most itself.
+
+    Returns:
+        List[Tuple[str, CategoryNode]]: (path, category) of every match, in tree order.
+    """
+    pattern_list = pattern.split("/")
+    matches = []
+    stack = [(category, []) for category in reversed(root_categories)]
+    while stack:
+        category, parent_path_list = stack.pop()
+        depth = len(parent_path_list)
+        if not fnmatch.fnmatchcase(category.name, pattern_list[depth]):
+            continue
+
+        path_list = parent_path_list + [category.name]
+        if depth + 1 == len(pattern_list):
+            matches.append(("/".join(path_list), category))
+        else:
+            stack.extend((child, path_list) for child in reversed(category.children))
+    return matches
+
+
+@resolve_again_on_stale_index
 def remove_category(category_path: str) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-
     category_path_list = category_path.split("/")
     category_id_resp = get_category_id_by_path(category_path_list)
     if not category_id_resp.is_success:
-        return APIResponse(is_success=False, error_message=category_id_resp.error_message)
+        return category_id_resp
 
-    category_id = category_id_resp.body["categoryId"]
-    resp = requests.delete(
-        url=urljoin(BASE_URL, f"categories/{category_id}"),
-        headers={"Authorization": "Bearer " + access_token},
-    )
+    return remove_category_by_id(category_id_resp.body["categoryId"], category_path_list)
 
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True)
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to remove a category"
 
-        return APIResponse(is_success=False, error_message=error_message)
+def remove_category_by_id(category_id: int, category_path_list: List[str]) -> APIResponse:
+    """Remove a category whose id is already known. `category_path_list` is only used to patch the cached tree."""
+    resp = APIClient.delete(f"categories/{category_id}", error_message="Failed to remove a category")
+    sync_cached_categories(resp, remove_category_node(category_path_list))
+    # Removing a category also removes its tasks
+    ResponseCache.invalidate("events", "tags")
+    if not resp.is_success:
+        return resp
+    return APIResponse(is_success=True, retry_count=resp.retry_count)
 
 
+@resolve_again_on_stale_index
 def update_category(category_path: str, new_name: Optional[str] = None, new_color: Optional[str] = None) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-
     category_path_list = category_path.split("/")
     category_id_resp = get_category_id_by_path(category_path_list)
     if not category_id_resp.is_success:
         return category_id_resp
 
-    category_id = category_id_resp.body["categoryId"]
+    return update_category_by_id(category_id_resp.body["categoryId"], category_path_list, new_name, new_color)
+
+
+def update_category_by_id(
+    category_id: int, category_path_list: List[str], new_name: Optional[str] = None, new_color: Optional[str] = None
+) -> APIResponse:
+    """Update a category whose id is already known. `category_path_list` is only used to patch the cached tree."""
     body = {}
     if new_name:
         body["newName"] = new_name
     if new_color:
         body["color"] = new_color
 
-    resp = requests.patch(
-        url=urljoin(BASE_URL, f"categories/{category_id}"),
-        headers={"Authorization": "Bearer " + access_token},
-        json=body,
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True)
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to rename a category"
-
-        return APIResponse(is_success=False, error_message=error_message)
+    resp = APIClient.patch(f"categories/{category_id}", json=body, error_message="Failed to rename a category")
+    sync_cached_categories(resp, update_category_node(category_path_list, new_name, new_color))
+    # Events embed their category path and color
+    ResponseCache.invalidate("events")
+    if not resp.is_success:
+        return resp
+    return APIResponse(is_success=True, retry_count=resp.retry_count)
 
 
+@resolve_again_on_stale_index
 def move_category(path: str, new_parent_path: str) -> APIResponse:
     # girok mvcat A/B/C D/E
-    access_token = AuthHandler.get_access_token()
-
     path_list = path.split("/")
     new_parent_path_list = new_parent_path.split("/") if new_parent_path else []
 
@@ -147,42 +220,51 @@ def move_category(path: str, new_parent_path: str) -> APIResponse:
         return resp
     new_parent_category_id = resp.body["categoryId"]
 
-    resp = requests.patch(
-        url=urljoin(BASE_URL, f"categories/{category_id}/parent"),
-        headers={"Authorization": "Bearer " + access_token},
+    return move_category_by_id(category_id, path_list, new_parent_category_id, new_parent_path_list)
+
+
+def move_category_by_id(
+    category_id: int, path_list: List[str], new_parent_category_id: Optional[int], new_parent_path_list: List[str]
+) -> APIResponse:
+    """Move a category whose id, and its new parent's id, are already known. The paths are only used to patch
+    the cached tree."""
+    resp = APIClient.patch(
+        f"categories/{category_id}/parent",
         json={"newParentId": new_parent_category_id},
+        error_message="Failed to move a category",
     )
+    sync_cached_categories(resp, move_category_node(path_list, new_parent_path_list))
+    ResponseCache.invalidate("events")
+    if not resp.is_success:
+        return resp
+    return APIResponse(is_success=True, retry_count=resp.retry_count)
 
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True)
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to move a category"
-        return APIResponse(is_success=False, error_message=error_message)
+
+def sync_cached_categories(resp: APIResponse, patch: Callable[[list], bool]) -> None:
+    """Patch the cached tree after a successful mutation. After a failed one, the tree is dropped: the failure may
+    well come from the tree being out of date."""
+    if resp.is_success:
+        patch_cached_categories(patch)
+    else:
+        ResponseCache.invalidate("categories")
 
 
 def get_category_id_by_path(path_list: list[str]) -> APIResponse:
     if len(path_list) == 0:
         return APIResponse(is_success=True, body={"categoryId": None})
 
-    access_token = AuthHandler.get_access_token()
-    resp = requests.get(
-        url=urljoin(BASE_URL, "categories/id-by-path"),
-        headers={"Authorization": "Bearer " + access_token},
+    # Without a usable tree, fetching (or revalidating) the whole tree costs the same one request as resolving this
+    # single path, and the following lookups are then answered locally
+    if not CategoryIndex.is_available() and not ResponseCache.bypass:
+        get_all_categories()
+
+    category_id = CategoryIndex.lookup(path_list)
+    if category_id is not None:
+        return APIResponse(is_success=True, body={"categoryId": category_id})
+
+    resp = APIClient.get(
+        "categories/id-by-path",
         params={"path": path_list},
+        error_message=f"Failed to get a category id of '{path_list}'",
     )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = f"Failed to get a category id of '{path_list}'"
-        return APIResponse(is_success=False, error_message=error_message)
+    return decode_body(resp, CATEGORY_ID_BODY)
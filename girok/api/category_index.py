@@ -0,0 +1,73 @@
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from girok.api.entity import CategoryNode
+from girok.api.response_cache import CacheEntry, ResponseCache
+from girok.api.schema import CATEGORIES_BODY, SchemaError
+from girok.config.config_store import get_file_stamp
+from girok.constants import CATEGORY_INDEX_MAX_AGE
+
+
+class CategoryIndex:
+    """Category path -> id, built from the cached body of `GET categories`.
+
+    The tree is used for CATEGORY_INDEX_MAX_AGE seconds, well past the response cache TTL, so that the category
+    commands of a session resolve paths without a round trip. That is also how long a change made on another
+    device can go unnoticed: a path renamed there and then reused would resolve to the old category without any
+    error. After that, the tree is revalidated with a conditional GET before the next lookup.
+
+    Category mutations made here patch the cached tree (see `girok.api.category_tree`), so the index reflects
+    them right away. A category removed or moved from another device shows up as a CATEGORY_NOT_FOUND error,
+    which `girok.api.category` answers by dropping the tree and resolving the path again through the server.
+
+    The index is rebuilt when the cached body changes on disk.
+    """
+
+    _ids: Dict[Tuple[str, ...], int] = {}
+    _stamp: Optional[tuple] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return is_usable(ResponseCache.get("categories"))
+
+    @classmethod
+    def lookup(cls, path_list: List[str]) -> Optional[int]:
+        """Return the id of the category, or None if the path isn't in the cached tree (or there is no tree)."""
+        entry = ResponseCache.get("categories")
+        if not is_usable(entry):
+            return None
+
+        with cls._lock:
+            stamp = (entry.stored_at, get_file_stamp(entry.body_path))
+            if stamp != cls._stamp:
+                try:
+                    body = entry.read_body()
+                except OSError:  # replaced or removed in the meantime
+                    return None
+                cls._ids = build_index(load_categories(body))
+                cls._stamp = stamp
+            return cls._ids.get(tuple(path_list))
+
+
+def is_usable(entry: Optional[CacheEntry]) -> bool:
+    return entry is not None and entry.age < CATEGORY_INDEX_MAX_AGE and not ResponseCache.bypass
+
+
+def load_categories(body: bytes) -> List[CategoryNode]:
+    try:
+        return CATEGORIES_BODY.decode(json.loads(body))["rootCategories"]
+    except (ValueError, SchemaError):
+        return []
+
+
+def build_index(categories: List[CategoryNode]) -> Dict[Tuple[str, ...], int]:
+    ids = {}
+    stack = [(category, ()) for category in categories]
+    while stack:
+        category, parent_path = stack.pop()
+        path = parent_path + (category.name,)
+        ids[path] = category.id
+        stack.extend((child, path) for child in category.children)
+    return ids
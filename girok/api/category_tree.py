@@ -0,0 +1,138 @@
+"""Edits of the cached category tree (the body of `GET categories`) that mirror successful category mutations.
+
+After `addcat`, `rmcat`, `upcat` or `mvcat`, the cached tree is patched in place of being thrown away, so the
+redraw that follows, and CategoryIndex, are served without fetching the tree again. The tree is dropped instead,
+and fetched on next use, whenever the patch can't be applied with certainty:
+- there is no cached tree, or it is past its TTL, so it may already be missing other changes;
+- a path of the mutation isn't in the cached tree.
+
+Patches work on the raw JSON (dicts with 'id', 'name', 'color' and 'children'). Every patch checks all of its
+preconditions before changing anything, and returns whether it applied.
+"""
+
+import json
+import threading
+from typing import Callable, List, Optional
+
+from girok.api.response_cache import ResponseCache
+
+CATEGORIES_ENDPOINT = "categories"
+
+# Mutations run in parallel by bulk category commands patch the same cached tree
+_patch_lock = threading.Lock()
+
+
+def patch_cached_categories(patch: Callable[[list], bool]) -> None:
+    with _patch_lock:
+        entry = ResponseCache.get(CATEGORIES_ENDPOINT)
+        body = None
+        if entry is not None and ResponseCache.is_fresh(entry):
+            try:
+                body = json.loads(entry.read_body())
+            except (OSError, ValueError):
+                pass
+
+        if body is None or not patch(body["rootCategories"]):
+            ResponseCache.invalidate(CATEGORIES_ENDPOINT)
+            return
+
+        # No validators: the patched copy doesn't match any server version, so it is fetched in full once stale
+        ResponseCache.put(CATEGORIES_ENDPOINT, None, json.dumps(body).encode())
+
+
+def add_category_node(category_id: int, path_list: List[str], color: Optional[str]) -> Callable[[list], bool]:
+    def patch(root_categories: list) -> bool:
+        siblings = find_children(root_categories, path_list[:-1])
+        if siblings is None or find_by_name(siblings, path_list[-1]) is not None:
+            return False
+
+        # Subcategories take the color of their top-level category
+        node_color = color
+        if len(path_list) > 1:
+            node_color = find_category(root_categories, path_list[:1])["color"]
+        if node_color is None:
+            return False
+
+        siblings.append({"id": category_id, "name": path_list[-1], "color": node_color, "children": []})
+        return True
+
+    return patch
+
+
+def remove_category_node(path_list: List[str]) -> Callable[[list], bool]:
+    def patch(root_categories: list) -> bool:
+        siblings = find_children(root_categories, path_list[:-1])
+        category = find_by_name(siblings, path_list[-1]) if siblings is not None else None
+        if category is None:
+            return False
+
+        siblings.remove(category)
+        return True
+
+    return patch
+
+
+def update_category_node(
+    path_list: List[str], new_name: Optional[str], new_color: Optional[str]
+) -> Callable[[list], bool]:
+    def patch(root_categories: list) -> bool:
+        siblings = find_children(root_categories, path_list[:-1])
+        category = find_by_name(siblings, path_list[-1]) if siblings is not None else None
+        if category is None:
+            return False
+        if new_name and new_name != category["name"] and find_by_name(siblings, new_name) is not None:
+            return False
+
+        if new_name:
+            category["name"] = new_name
+        if new_color:
+            set_color(category, new_color)
+        return True
+
+    return patch
+
+
+def move_category_node(path_list: List[str], new_parent_path_list: List[str]) -> Callable[[list], bool]:
+    def patch(root_categories: list) -> bool:
+        siblings = find_children(root_categories, path_list[:-1])
+        category = find_by_name(siblings, path_list[-1]) if siblings is not None else None
+        new_siblings = find_children(root_categories, new_parent_path_list)
+        if category is None or new_siblings is None or find_by_name(new_siblings, category["name"]) is not None:
+            return False
+        # A category can't move under itself
+        if new_parent_path_list[: len(path_list)] == path_list:
+            return False
+
+        siblings.remove(category)
+        new_siblings.append(category)
+        if new_parent_path_list:
+            set_color(category, find_category(root_categories, new_parent_path_list[:1])["color"])
+        return True
+
+    return patch
+
+
+def find_category(root_categories: list, path_list: List[str]) -> Optional[dict]:
+    siblings = find_children(root_categories, path_list[:-1])
+    return find_by_name(siblings, path_list[-1]) if siblings is not None else None
+
+
+def find_children(root_categories: list, path_list: List[str]) -> Optional[list]:
+    """Children of the category at `path_list`, or the top-level categories for an empty path."""
+    children = root_categories
+    for name in path_list:
+        category = find_by_name(children, name)
+        if category is None:
+            return None
+        children = category["children"]
+    return children
+
+
+def find_by_name(categories: list, name: str) -> Optional[dict]:
+    return next((category for category in categories if category["name"] == name), None)
+
+
+def set_color(category: dict, color: str) -> None:
+    category["color"] = color
+    for child in category["children"]:
+        set_color(child, color)
@@ -1,4 +1,15 @@
 from dataclasses import dataclass
+from typing import List
+
+from girok.constants import (
+    API_BACKOFF_BASE,
+    API_BACKOFF_MAX,
+    API_CONNECT_TIMEOUT,
+    API_MAX_RETRIES,
+    API_READ_TIMEOUT,
+    API_RETRY_AFTER_MAX,
+    API_RETRY_STATUS_CODES,
+)
 
 
 @dataclass
@@ -6,6 +17,8 @@ class APIResponse:
     is_success: bool
     body: dict = None
     error_message: str = None
+    error_code: str = None
+    retry_count: int = 0
 
     def __post_init__(self):
         if self.is_success:
@@ -16,3 +29,48 @@ class APIResponse:
                 raise ValueError("Failure response requires an error message.")
             if self.body is not None:
                 raise ValueError("Failure response should not have a body.")
+
+
+class StreamError(Exception):
+    """The connection failed while a streamed response body was being consumed. The message is meant for the user,
+    like `APIResponse.error_message`."""
+
+
+@dataclass
+class CategoryNode:
+    """A category of the tree returned by 'GET categories'."""
+
+    __slots__ = ("id", "name", "color", "children")
+
+    id: int
+    name: str
+    color: str
+    children: List["CategoryNode"]
+
+
+@dataclass
+class RequestPolicy:
+    """Timeout and retry policy applied by APIClient.
+
+    Only idempotent requests (GET) are retried. A retry happens on connection errors, timeouts and on the
+    status codes in `retry_status_codes`, waiting for `Retry-After` if the server sends one, or for an
+    exponential backoff with full jitter otherwise.
+    """
+
+    connect_timeout: float = API_CONNECT_TIMEOUT
+    read_timeout: float = API_READ_TIMEOUT
+    max_retries: int = API_MAX_RETRIES
+    backoff_base: float = API_BACKOFF_BASE
+    backoff_max: float = API_BACKOFF_MAX
+    retry_after_max: float = API_RETRY_AFTER_MAX
+    retry_status_codes: tuple = API_RETRY_STATUS_CODES
+
+    def __post_init__(self):
+        if self.max_retries < 0:
+            raise ValueError("max_retries must be non-negative.")
+        if self.connect_timeout <= 0 or self.read_timeout <= 0:
+            raise ValueError("Timeouts must be positive.")
+
+    @property
+    def timeout(self) -> tuple:
+        return (self.connect_timeout, self.read_timeout)
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Optional
+
+from girok.constants import API_BULK_MIN_RATE, API_BULK_RATE_STEP, API_THROTTLE_STATUS_CODES
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how fast requests are sent.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per second. Every request takes one.
+    The rate adapts to the server (AIMD): a throttling response (429 / 503) halves it, down to `min_rate`,
+    and honors `Retry-After` by pausing the whole bucket. Every other response raises it by `rate_step`
+    until it's back at the initial rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: float = API_BULK_MIN_RATE,
+        rate_step: float = API_BULK_RATE_STEP,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity must be at least 1.")
+
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate_step = rate_step
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(delay)
+
+    def observe(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        """Adapt the rate to the response of a request sent after `acquire()`."""
+        with self._lock:
+            if status_code in API_THROTTLE_STATUS_CODES:
+                self.refill(time.monotonic())
+                self.rate = max(self.min_rate, self.rate / 2)
+                # Drop the burst allowance so that the slow-down takes effect right away
+                self.tokens = min(self.tokens, 0)
+                if retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+from girok.constants import API_STREAM_CHUNK_SIZE, RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_AGE, RESPONSE_CACHE_TTL
+from girok.utils.file_utils import file_lock
+from girok.utils.json_utils import read_json, replace_json
+
+
+@dataclass
+class CacheEntry:
+    endpoint: str
+    params: Optional[dict]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    body_path: str
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def read_body(self) -> bytes:
+        with open(self.body_path, "rb") as f:
+            return f.read()
+
+    def iter_body(self) -> Iterator[bytes]:
+        with open(self.body_path, "rb") as f:
+            while True:
+                chunk = f.read(API_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def to_dict(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "params": self.params,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "stored_at": self.stored_at,
+        }
+
+
+class ResponseCache:
+    """Local copies of GET response bodies, stored under RESPONSE_CACHE_DIR.
+
+    Every entry is keyed by endpoint + query params and consists of two files:
+    '<key>.json' holding the validators (ETag / Last-Modified) and the time it was stored,
+    and '<key>.body' holding the raw response body. Files are replaced atomically, and writers hold the cache
+    directory's lock ('response_cache.lock'), so girok processes running in parallel can share the cache.
+
+    An entry younger than `ttl` seconds is served without touching the network. An older one is revalidated
+    with a conditional GET. `bypass` (the `--fresh` option) ignores stored entries for the current process.
+
+    With `record_access` on, `accessed` maps the key of every entry looked up from the main thread to the time of
+    the last lookup and the entry's endpoint and params. The daemon uses it to refresh only what its commands use.
+    """
+
+    ttl: float = RESPONSE_CACHE_TTL
+    bypass: bool = False
+    record_access: bool = False
+    accessed: Dict[str, Tuple[float, str, Optional[dict]]] = {}
+
+    @classmethod
+    def configure(cls, ttl: Optional[float] = None, bypass: Optional[bool] = None) -> None:
+        if ttl is not None:
+            cls.ttl = ttl
+        if bypass is not None:
+            cls.bypass = bypass
+
+    @classmethod
+    def get(cls, endpoint: str, params: Optional[dict] = None) -> Optional[CacheEntry]:
+        if cls.record_access and threading.current_thread() is threading.main_thread():
+            cls.accessed[build_cache_key(endpoint, params)] = (time.time(), endpoint, params)
+        meta_path, body_path = get_entry_paths(endpoint, params)
+        return load_entry(meta_path, body_path)
+
+    @classmethod
+    def is_fresh(cls, entry: CacheEntry) -> bool:
+        return entry.age < cls.ttl
+
+    @classmethod
+    def put(
+        cls,
+        endpoint: str,
+        params: Optional[dict],
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        cache_writer = cls.open_writer(endpoint, params, etag=etag, last_modified=last_modified)
+        cache_writer.write(body)
+        cache_writer.commit()
+
+    @classmethod
+    def open_writer(
+        cls,
+        endpoint: str,
+        params: Optional[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> "CacheWriter":
+        """Open a writer for a body that arrives in chunks. The entry is replaced only on `commit()`."""
+        return CacheWriter(endpoint, params, etag=etag, last_modified=last_modified)
+
+    @classmethod
+    def touch(cls, entry: CacheEntry) -> None:
+        """Restart the TTL of an entry the server confirmed to be up to date."""
+        entry.stored_at = time.time()
+        meta_path, _ = get_entry_paths(entry.endpoint, entry.params)
+        with file_lock(RESPONSE_CACHE_DIR):
+            if os.path.exists(meta_path):
+                replace_json(meta_path, entry.to_dict())
+
+    @classmethod
+    def remove(cls, endpoint: str, params: Optional[dict] = None) -> None:
+        with file_lock(RESPONSE_CACHE_DIR):
+            for path in get_entry_paths(endpoint, params):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @classmethod
+    def invalidate(cls, *endpoints: str) -> None:
+        """Remove every entry of the given endpoints, whatever their params are.
+
+        An endpoint also covers its sub-resources, e.g. 'events' covers 'events/12'.
+        Entries that are past RESPONSE_CACHE_MAX_AGE are pruned along the way.
+        """
+        for entry in iter_entries():
+            is_target = any(entry.endpoint == e or entry.endpoint.startswith(e + "/") for e in endpoints)
+            if is_target or entry.age > RESPONSE_CACHE_MAX_AGE:
+                cls.remove(entry.endpoint, entry.params)
+
+    @classmethod
+    def clear(cls) -> None:
+        shutil.rmtree(RESPONSE_CACHE_DIR, ignore_errors=True)
+
+
+class CacheWriter:
+    def __init__(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+        self.endpoint = endpoint
+        self.params = params
+        self.etag = etag
+        self.last_modified = last_modified
+        self.meta_path, self.body_path = get_entry_paths(endpoint, params)
+        self.tmp_path = f"{self.body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self.file = open(self.tmp_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+
+    def commit(self) -> None:
+        self.file.close()
+        entry = CacheEntry(
+            endpoint=self.endpoint,
+            params=self.params,
+            etag=self.etag,
+            last_modified=self.last_modified,
+            stored_at=time.time(),
+            body_path=self.body_path,
+        )
+        # Body and metadata are swapped in together so that an entry never pairs one response's body with
+        # another response's ETag
+        with file_lock(RESPONSE_CACHE_DIR):
+            os.replace(self.tmp_path, self.body_path)
+            replace_json(self.meta_path, entry.to_dict())
+
+    def discard(self) -> None:
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def iter_entries():
+    if not os.path.isdir(RESPONSE_CACHE_DIR):
+        return
+
+    for file_name in os.listdir(RESPONSE_CACHE_DIR):
+        if not file_name.endswith(".json"):
+            continue
+        meta_path = os.path.join(RESPONSE_CACHE_DIR, file_name)
+        entry = load_entry(meta_path, meta_path[: -len(".json")] + ".body")
+        if entry is not None:
+            yield entry
+
+
+def load_entry(meta_path: str, body_path: str) -> Optional[CacheEntry]:
+    if not os.path.exists(meta_path) or not os.path.exists(body_path):
+        return None
+
+    try:
+        meta = read_json(meta_path)
+    except (OSError, ValueError):
+        return None
+
+    return CacheEntry(
+        endpoint=meta["endpoint"],
+        params=meta["params"],
+        etag=meta["etag"],
+        last_modified=meta["last_modified"],
+        stored_at=meta["stored_at"],
+        body_path=body_path,
+    )
+
+
+def build_cache_key(endpoint: str, params: Optional[dict] = None) -> str:
+    # requests drops None-valued params, so they don't take part in the key either
+    normalized_params = {k: v for k, v in (params or {}).items() if v is not None}
+    raw_key = json.dumps([endpoint, normalized_params], sort_keys=True, default=str)
+    return hashlib.sha1(raw_key.encode()).hexdigest()
+
+
+def get_entry_paths(endpoint: str, params: Optional[dict] = None) -> tuple:
+    key = build_cache_key(endpoint, params)
+    return os.path.join(RESPONSE_CACHE_DIR, f"{key}.json"), os.path.join(RESPONSE_CACHE_DIR, f"{key}.body")
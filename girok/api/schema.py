@@ -0,0 +1,243 @@
+"""Typed decoding of API response bodies.
+
+A `Schema` describes how a JSON object maps onto an entity class. It is compiled once, at import time, into a
+plain Python function that reads every key, checks its type and builds the entity with positional arguments,
+so decoding costs about as much as the hand-written mapping it replaces while also validating the payload.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from girok.api.entity import APIResponse, CategoryNode
+from girok.commands.task.entity import Category, Event, EventDate, Repetition
+from girok.constants import CATEGORY_COLOR_PALETTE
+from girok.utils.trace import Tracer
+
+SELF = "self"
+
+
+class SchemaError(ValueError):
+    def __init__(self, path: str, reason: str):
+        super().__init__(f"{path}: {reason}" if path else reason)
+        self.path = path
+        self.reason = reason
+
+    def prefixed(self, key: Union[str, int]) -> "SchemaError":
+        segment = f"[{key}]" if isinstance(key, int) else key
+        if not self.path:
+            path = segment
+        elif self.path.startswith("["):
+            path = f"{segment}{self.path}"
+        else:
+            path = f"{segment}.{self.path}"
+        return SchemaError(path, self.reason)
+
+
+@dataclass(frozen=True)
+class ListOf:
+    item: Any
+
+
+@dataclass(frozen=True)
+class Field:
+    """A single key of a JSON object.
+
+    Args:
+        attr (str): Constructor argument of the entity the value is passed as.
+        key (str): Key in the JSON object.
+        type (Any): One of `str`, `int`, `bool`, a `Schema`, `ListOf(...)` or `SELF` for recursive schemas.
+        nullable (bool, optional): Whether null is accepted. Defaults to False.
+        choices (Optional[Iterable], optional): Allowed values. Defaults to None.
+    """
+
+    attr: str
+    key: str
+    type: Any
+    nullable: bool = False
+    choices: Optional[Iterable] = None
+
+
+class Schema:
+    def __init__(self, name: str, target: Callable, fields: List[Field]):
+        """
+        Args:
+            name (str): Name used in error messages and in the generated code.
+            target (Callable): Entity class, called with the field values in order. `dict` builds a dictionary
+                keyed by `Field.attr` instead.
+            fields (List[Field]): Fields in the order of the target's constructor arguments.
+        """
+        self.name = name
+        self.target = target
+        self.fields = fields
+        self.decode: Callable[[Any], Any] = compile_decoder(self)
+
+    def decode_list(self, items: Iterable[Any]) -> List[Any]:
+        decode = self.decode
+        try:
+            return [decode(item) for item in items]
+        except SchemaError:
+            # Re-run item by item only to find out the failing index
+            for idx, item in enumerate(items):
+                try:
+                    decode(item)
+                except SchemaError as e:
+                    raise e.prefixed(idx) from None
+            raise
+
+    def iter_decode(self, items: Iterable[Any]) -> Iterator[Any]:
+        decode = self.decode
+        for idx, item in enumerate(items):
+            try:
+                yield decode(item)
+            except SchemaError as e:
+                raise e.prefixed(idx) from None
+
+
+def compile_decoder(schema: Schema) -> Callable[[Any], Any]:
+    namespace = {"SchemaError": SchemaError, "target": schema.target, "schema": schema}
+    lines = [
+        "def decode(obj):",
+        "    if type(obj) is not dict:",
+        f"        raise SchemaError('', 'expected {schema.name} object, got ' + type(obj).__name__)",
+    ]
+
+    for idx, field in enumerate(schema.fields):
+        var = f"v{idx}"
+        lines.append("    try:")
+        lines.append(f"        {var} = obj[{field.key!r}]")
+        lines.append("    except KeyError:")
+        lines.append(f"        raise SchemaError({field.key!r}, 'missing') from None")
+
+        indent = "    "
+        if field.nullable:
+            lines.append(f"    if {var} is not None:")
+            indent = "        "
+
+        field_type = field.type
+        if isinstance(field_type, ListOf):
+            lines.append(f"{indent}if type({var}) is not list:")
+            lines.append(f"{indent}    raise SchemaError({field.key!r}, 'expected list, got ' + type({var}).__name__)")
+            field_type = field_type.item
+            if field_type in (str, int, bool):
+                type_name = field_type.__name__
+                namespace[type_name] = field_type
+                lines.append(f"{indent}for item in {var}:")
+                lines.append(f"{indent}    if type(item) is not {type_name}:")
+                lines.append(
+                    f"{indent}        raise SchemaError({field.key!r}, 'expected list of {type_name}, "
+                    f"got ' + type(item).__name__)"
+                )
+            else:
+                nested = "schema" if field_type == SELF else f"decode_{idx}"
+                namespace[f"decode_{idx}"] = field_type
+                lines.append(f"{indent}try:")
+                lines.append(f"{indent}    {var} = {nested}.decode_list({var})")
+                lines.append(f"{indent}except SchemaError as e:")
+                lines.append(f"{indent}    raise e.prefixed({field.key!r}) from None")
+        elif field_type in (str, int, bool):
+            type_name = field_type.__name__
+            namespace[type_name] = field_type
+            lines.append(f"{indent}if type({var}) is not {type_name}:")
+            lines.append(
+                f"{indent}    raise SchemaError({field.key!r}, 'expected {type_name}, got ' + type({var}).__name__)"
+            )
+        else:
+            nested = "schema" if field_type == SELF else f"decode_{idx}"
+            namespace[f"decode_{idx}"] = field_type
+            lines.append(f"{indent}try:")
+            lines.append(f"{indent}    {var} = {nested}.decode({var})")
+            lines.append(f"{indent}except SchemaError as e:")
+            lines.append(f"{indent}    raise e.prefixed({field.key!r}) from None")
+
+        if field.choices is not None:
+            namespace[f"choices_{idx}"] = frozenset(field.choices)
+            lines.append(f"{indent}if {var} not in choices_{idx}:")
+            lines.append(f"{indent}    raise SchemaError({field.key!r}, 'unexpected value ' + repr({var}))")
+
+    args = ", ".join(f"v{idx}" for idx in range(len(schema.fields)))
+    if schema.target is dict:
+        items = ", ".join(f"{field.attr!r}: v{idx}" for idx, field in enumerate(schema.fields))
+        lines.append(f"    return {{{items}}}")
+    else:
+        lines.append(f"    return target({args})")
+
+    exec(compile("\n".join(lines), f"<schema {schema.name}>", "exec"), namespace)
+    return namespace["decode"]
+
+
+def decode_body(resp: APIResponse, schema: Schema) -> APIResponse:
+    """Decode the body of a successful response. A body that doesn't match the schema turns into a failure."""
+    if not resp.is_success:
+        return resp
+
+    try:
+        with Tracer.stage(f"decode {schema.name}"):
+            body = schema.decode(resp.body)
+    except SchemaError as e:
+        return APIResponse(is_success=False, error_message=f"Unexpected response from the server ({e})")
+    return APIResponse(is_success=True, body=body, retry_count=resp.retry_count)
+
+
+EVENT_DATE = Schema(
+    "EventDate",
+    EventDate,
+    [
+        Field("start_date", "startDate", str),
+        Field("start_time", "startTime", str, nullable=True),
+        Field("end_date", "endDate", str, nullable=True),
+        Field("end_time", "endTime", str, nullable=True),
+    ],
+)
+
+REPETITION = Schema(
+    "Repetition",
+    Repetition,
+    [
+        Field("repetition_type", "repetitionType", str, nullable=True),
+        Field("repetition_end_date", "repetitionEndDate", str, nullable=True),
+    ],
+)
+
+CATEGORY = Schema(
+    "Category",
+    Category,
+    [
+        Field("id", "categoryId", int),
+        Field("name", "categoryName", str),
+    ],
+)
+
+EVENT = Schema(
+    "Event",
+    Event,
+    [
+        Field("id", "id", int),
+        Field("name", "name", str),
+        Field("color_str", "color", str, choices=CATEGORY_COLOR_PALETTE),
+        Field("tags", "tags", ListOf(str)),
+        Field("priority", "priority", str, nullable=True),
+        Field("memo", "memo", str, nullable=True),
+        Field("event_date", "eventDate", EVENT_DATE),
+        Field("repetition", "repetition", REPETITION),
+        Field("category_path", "categoryPath", ListOf(CATEGORY)),
+    ],
+)
+
+CATEGORY_NODE = Schema(
+    "CategoryNode",
+    CategoryNode,
+    [
+        Field("id", "id", int),
+        Field("name", "name", str),
+        Field("color", "color", str, choices=CATEGORY_COLOR_PALETTE),
+        Field("children", "children", ListOf(SELF)),
+    ],
+)
+
+EVENTS_BODY = Schema("events", dict, [Field("events", "events", ListOf(EVENT))])
+CREATED_EVENT_BODY = Schema("created event", dict, [Field("eventId", "eventId", int)])
+TAGS_BODY = Schema("tags", dict, [Field("tags", "tags", ListOf(str))])
+CATEGORIES_BODY = Schema("categories", dict, [Field("rootCategories", "rootCategories", ListOf(CATEGORY_NODE))])
+CREATED_CATEGORY_BODY = Schema("created category", dict, [Field("categoryId", "categoryId", int)])
+CATEGORY_ID_BODY = Schema("category id", dict, [Field("categoryId", "categoryId", int, nullable=True)])
+LOGIN_BODY = Schema("login", dict, [Field("accessToken", "accessToken", str)])
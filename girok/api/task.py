@@ -1,15 +1,13 @@
 from typing import List, Optional
-from urllib.parse import urljoin
 
-import requests
-from requests import HTTPError
-
-from girok.api.category import get_category_id_by_path
+from girok.api.category import get_category_id_by_path, resolve_again_on_stale_index
 from girok.api.entity import APIResponse
-from girok.config.auth_handler import AuthHandler
-from girok.constants import BASE_URL
+from girok.api.response_cache import ResponseCache
+from girok.api.schema import CREATED_EVENT_BODY, EVENT, EVENTS_BODY, TAGS_BODY, decode_body
+from girok.api_client import APIClient
 
 
+@resolve_again_on_stale_index
 def create_task(
     name: str,
     start_date: str,
@@ -23,8 +21,6 @@ def create_task(
     priority: Optional[str],
     memo: Optional[str],
 ) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-
     # Resolve target category id
     category_id = None
     if category_path is not None:
@@ -35,6 +31,36 @@ def create_task(
         if not resp.is_success:
             return resp
         category_id = resp.body["categoryId"]
+
+    return create_task_in_category(
+        category_id=category_id,
+        name=name,
+        start_date=start_date,
+        start_time=start_time,
+        end_date=end_date,
+        end_time=end_time,
+        repetition_type=repetition_type,
+        repetition_end_date=repetition_end_date,
+        tags=tags,
+        priority=priority,
+        memo=memo,
+    )
+
+
+def create_task_in_category(
+    category_id: Optional[int],
+    name: str,
+    start_date: str,
+    start_time: Optional[str],
+    end_date: Optional[str],
+    end_time: Optional[str],
+    repetition_type: Optional[str],
+    repetition_end_date: Optional[str],
+    tags: Optional[List[str]],
+    priority: Optional[str],
+    memo: Optional[str],
+) -> APIResponse:
+    """Same as `create_task`, for a category id that is already resolved (None for no category)."""
     request_body = {
         "categoryId": category_id,
         "name": name,
@@ -45,23 +71,12 @@ def create_task(
         "memo": memo,
     }
 
-    resp = requests.post(
-        url=urljoin(BASE_URL, "events"), headers={"Authorization": "Bearer " + access_token}, json=request_body
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to create a new task"
-
-        return APIResponse(is_success=False, error_message=error_message)
+    resp = APIClient.post("events", json=request_body, error_message="Failed to create a new task")
+    ResponseCache.invalidate("events", "tags")
+    return decode_body(resp, CREATED_EVENT_BODY)
 
 
+@resolve_again_on_stale_index
 def update_task(
     event_id: int,
     name: str,
@@ -76,8 +91,6 @@ def update_task(
     priority: Optional[str],
     memo: Optional[str],
 ) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-
     # Resolve target category id
     category_id = None
     if category_path is not None:
@@ -99,44 +112,16 @@ def update_task(
         "memo": memo,
     }
 
-    resp = requests.put(
-        url=urljoin(BASE_URL, f"events/{event_id}"),
-        headers={"Authorization": "Bearer " + access_token},
-        json=request_body
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True)
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to create a new task"
-
-        return APIResponse(is_success=False, error_message=error_message)
-
+    resp = APIClient.put(f"events/{event_id}", json=request_body, error_message="Failed to create a new task")
+    ResponseCache.invalidate("events", "tags")
+    if not resp.is_success:
+        return resp
+    return APIResponse(is_success=True, retry_count=resp.retry_count)
 
 
 def get_single_event(event_id: int) -> APIResponse:
-    access_token = AuthHandler.get_access_token()
-    resp = requests.get(
-        url=urljoin(BASE_URL, f"events/{event_id}"),
-        headers={"Authorization": "Bearer " + access_token}
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to retrieve a task"
-
-        return APIResponse(is_success=False, error_message=error_message)
+    resp = APIClient.get(f"events/{event_id}", error_message="Failed to retrieve a task")
+    return decode_body(resp, EVENT)
 
 
 def get_all_tasks(
@@ -145,8 +130,12 @@ def get_all_tasks(
     category_id: Optional[int] = None,
     priority: Optional[str] = None,
     tags: Optional[List[str]] = None,
-    fetch_children: bool = False
+    fetch_children: bool = False,
+    stream: bool = False,
 ):
+    """Retrieve events as `Event` entities. With `stream=True`, body["events"] is an iterator decoding events
+    one by one from the response body instead of a list, and must be consumed right away. It raises
+    ValueError if the body turns out to be malformed halfway through."""
     params = {
         "startDate": start_date,
         "endDate": end_date,
@@ -155,59 +144,27 @@ def get_all_tasks(
         "tags": tags,
         "fetchCategoryChildren": fetch_children
     }
-
-    access_token = AuthHandler.get_access_token()
-    resp = requests.get(
-        url=urljoin(BASE_URL, "events"), headers={"Authorization": "Bearer " + access_token}, params=params
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to retrieve tasks"
-
-        return APIResponse(is_success=False, error_message=error_message)
+    if stream:
+        resp = APIClient.get_stream(
+            "events", "events", params=params, error_message="Failed to retrieve tasks", cache=True
+        )
+        if not resp.is_success:
+            return resp
+        return APIResponse(
+            is_success=True, body={"events": EVENT.iter_decode(resp.body["events"])}, retry_count=resp.retry_count
+        )
+    resp = APIClient.get("events", params=params, error_message="Failed to retrieve tasks", cache=True)
+    return decode_body(resp, EVENTS_BODY)
 
 
 def remove_event(event_id: int):
-    access_token = AuthHandler.get_access_token()
-    resp = requests.delete(
-        url=urljoin(BASE_URL, f"events/{event_id}"), headers={"Authorization": "Bearer " + access_token}
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True)
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to retrieve tasks"
-
-        return APIResponse(is_success=False, error_message=error_message)
+    resp = APIClient.delete(f"events/{event_id}", error_message="Failed to remove a task")
+    ResponseCache.invalidate("events", "tags")
+    if not resp.is_success:
+        return resp
+    return APIResponse(is_success=True, retry_count=resp.retry_count)
 
 
 def get_all_tags():
-    access_token = AuthHandler.get_access_token()
-    resp = requests.get(
-        url=urljoin(BASE_URL, "tags"),
-        headers={"Authorization": "Bearer " + access_token}
-    )
-
-    try:
-        resp.raise_for_status()
-        return APIResponse(is_success=True, body=resp.json())
-    except HTTPError:
-        try:
-            error_body = resp.json()
-            error_message = error_body["message"]
-        except:
-            error_message = "Failed to retrieve tags"
-
-        return APIResponse(is_success=False, error_message=error_message)
\ No newline at end of file
+    resp = APIClient.get("tags", error_message="Failed to retrieve tags", cache=True)
+    return decode_body(resp, TAGS_BODY)
@@ -0,0 +1,55 @@
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from girok.utils.trace import Tracer
+
+
+class TracingHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        # DNS lookup + TCP handshake
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self.new_conn_seconds = time.perf_counter() - start
+            Tracer.current_span().add_phase("connect", self.new_conn_seconds)
+
+
+class TracingHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self.new_conn_seconds = time.perf_counter() - start
+            Tracer.current_span().add_phase("connect", self.new_conn_seconds)
+
+    def connect(self) -> None:
+        self.new_conn_seconds = 0.0
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            Tracer.current_span().add_phase("tls", time.perf_counter() - start - self.new_conn_seconds)
+
+
+class TracingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracingHTTPConnection
+
+
+class TracingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracingHTTPSConnection
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report their connect and TLS handshake times to the current span."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TracingHTTPConnectionPool,
+            "https": TracingHTTPSConnectionPool,
+        }
@@ -1,10 +1,594 @@
+import asyncio
+import functools
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
 
-from girok.constants import BASE_URL
+from girok.api.entity import APIResponse, RequestPolicy, StreamError
+from girok.api.rate_limiter import TokenBucket
+from girok.api.response_cache import CacheEntry, CacheWriter, ResponseCache, build_cache_key
+from girok.api.transport import TracingHTTPAdapter
+from girok.constants import API_COALESCE_WINDOW, API_POOL_MAXSIZE, API_STREAM_CHUNK_SIZE, BASE_URL
+from girok.utils.json_utils import iter_json_array
+from girok.utils.trace import Span, Tracer
 
-# class APIClient:
+TIMEOUT_ERROR_MESSAGE = "Request timed out. The girok server is not responding."
+CONNECTION_ERROR_MESSAGE = "Failed to connect to the girok server."
 
-#     @classmethod
-#     def post(endpoint: str, )
+
+class InflightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[APIResponse] = None
+
+
+class APIClient:
+    """Shared HTTP client for every girok API call.
+
+    All requests go through a single pooled `requests.Session` so that the requests issued by one command
+    (e.g. token check -> category id lookup -> POST) reuse the same keep-alive connection.
+
+    Identical GETs are coalesced (single-flight): concurrent callers wait for the one in-flight request,
+    and callers arriving within `coalesce_window` seconds after it succeeded get the same decoded result.
+    Any other request (a mutation) forgets those results.
+
+    When `rate_limiter` is set (see girok.api.bulk.BulkExecutor), every HTTP request waits for a token first
+    and reports its status back so that the limiter slows down on 429 / 503.
+    """
+
+    _session: Optional[requests.Session] = None
+    _lock = threading.Lock()
+    _inflight: Dict[str, InflightCall] = {}
+    _recent: Dict[str, Tuple[float, APIResponse]] = {}
+    policy: RequestPolicy = RequestPolicy()
+    coalesce_window: float = API_COALESCE_WINDOW
+    rate_limiter: Optional[TokenBucket] = None
+
+    @classmethod
+    def configure(cls, policy: RequestPolicy) -> None:
+        cls.policy = policy
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        if cls._session is None:
+            session = requests.Session()
+            adapter_cls = TracingHTTPAdapter if Tracer.enabled else HTTPAdapter
+            adapter = adapter_cls(pool_connections=1, pool_maxsize=API_POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(
+                {"Accept": "application/json", "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+            )
+            cls._session = session
+        return cls._session
+
+    @classmethod
+    def close(cls) -> None:
+        if cls._session is not None:
+            cls._session.close()
+            cls._session = None
+
+    @classmethod
+    def request(
+        cls,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: bool = True,
+        error_message: str = "Request failed",
+        retry: Optional[bool] = None,
+        cache: bool = False,
+    ) -> APIResponse:
+        """Send a request to the girok server and decode the result.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Endpoint relative to BASE_URL, e.g. 'categories/id-by-path'.
+            params (Optional[dict], optional): Query parameters. Defaults to None.
+            json (Optional[dict], optional): JSON request body. Defaults to None.
+            headers (Optional[dict], optional): Extra headers. Defaults to None.
+            auth (bool, optional): Attach the stored access token as a Bearer token. Defaults to True.
+            error_message (str, optional): Fallback error message when the server doesn't provide one.
+            retry (Optional[bool], optional): Whether to retry on transient failures. Defaults to retrying
+                idempotent (GET) requests only.
+            cache (bool, optional): Keep a local copy of the response body in ResponseCache. A fresh copy is served
+                without a request and a stale one is revalidated with a conditional GET (If-None-Match /
+                If-Modified-Since). Only applies to GET. Defaults to False.
+
+        Returns:
+            APIResponse: Decoded response. `retry_count` tells how many retries were made.
+                Coalesced GETs share the same APIResponse, so its body must not be mutated.
+        """
+        send = functools.partial(
+            cls.send,
+            method,
+            endpoint,
+            params=params,
+            json=json,
+            headers=headers,
+            auth=auth,
+            error_message=error_message,
+            retry=retry,
+            cache=cache,
+        )
+
+        if method != "GET":
+            cls.forget_recent()
+            try:
+                return send()
+            finally:
+                cls.forget_recent()
+
+        # Requests with custom headers (e.g. verifying another access token) are never shared
+        if headers:
+            return send()
+
+        key = build_cache_key(endpoint, params) + ("" if auth else ":anonymous")
+        # `--fresh` must not be answered with a result from before (e.g. by an earlier command of `girok shell`)
+        if ResponseCache.bypass:
+            with cls._lock:
+                cls._recent.pop(key, None)
+        return cls.single_flight(key, send)
+
+    @classmethod
+    def single_flight(cls, key: str, send: Callable[[], APIResponse]) -> APIResponse:
+        with cls._lock:
+            recent = cls._recent.get(key)
+            if recent and time.monotonic() - recent[0] < cls.coalesce_window:
+                return recent[1]
+
+            call = cls._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = InflightCall()
+                cls._inflight[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            # The leader failed with an exception, so try on our own
+            return call.result if call.result is not None else send()
+
+        try:
+            call.result = send()
+            return call.result
+        finally:
+            with cls._lock:
+                del cls._inflight[key]
+                if call.result is not None and call.result.is_success:
+                    cls._recent[key] = (time.monotonic(), call.result)
+            call.done.set()
+
+    @classmethod
+    def forget_recent(cls) -> None:
+        with cls._lock:
+            cls._recent.clear()
+
+    @classmethod
+    def send(
+        cls,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: bool = True,
+        error_message: str = "Request failed",
+        retry: Optional[bool] = None,
+        cache: bool = False,
+    ) -> APIResponse:
+        """Send a request without coalescing. See `request` for the arguments."""
+        if retry is None:
+            retry = method == "GET"
+
+        with Tracer.span("api", f"{method} {endpoint}") as span:
+            request_headers = build_auth_headers() if auth else {}
+            if headers:
+                request_headers.update(headers)
+
+            cache = cache and method == "GET"
+            cache_entry = ResponseCache.get(endpoint, params) if cache and not ResponseCache.bypass else None
+            if cache:
+                span.attrs["cache"] = "bypass" if ResponseCache.bypass else "miss"
+            if cache_entry:
+                if ResponseCache.is_fresh(cache_entry):
+                    with span.phase("decode"):
+                        body = decode_cached_body(cache_entry)
+                    if body is not None:
+                        span.attrs["cache"] = "hit"
+                        return APIResponse(is_success=True, body=body)
+                request_headers.update(build_conditional_headers(cache_entry))
+
+            result, retry_count = cls.perform(method, endpoint, params, json, request_headers, retry)
+            if isinstance(result, APIResponse):
+                return result
+            resp = result
+
+            if auth and resp.status_code == 401:
+                return reject_access_token(resp, retry_count)
+
+            if cache_entry and resp.status_code == 304:
+                with span.phase("decode"):
+                    body = decode_cached_body(cache_entry)
+                if body is not None:
+                    span.attrs["cache"] = "revalidated"
+                    ResponseCache.touch(cache_entry)
+                    return APIResponse(is_success=True, body=body, retry_count=retry_count)
+
+                # The local copy is unusable, so fetch the full body again
+                ResponseCache.remove(endpoint, params)
+                return cls.send(
+                    method, endpoint, params=params, headers=headers, auth=auth, error_message=error_message
+                )
+
+            if cache and resp.ok:
+                store_response(endpoint, params, resp)
+
+            with span.phase("decode"):
+                return decode_response(resp, error_message, retry_count=retry_count)
+
+    @classmethod
+    def get_stream(
+        cls,
+        endpoint: str,
+        array_key: str,
+        params: Optional[dict] = None,
+        error_message: str = "Request failed",
+        cache: bool = False,
+    ) -> APIResponse:
+        """GET a JSON object and lazily decode the array stored under `array_key`.
+
+        On success the body is `{array_key: iterator}`. The iterator decodes the items one by one while the
+        (gzip-compressed) response is being received, so the full body is never held in memory. It must be
+        consumed right away since it holds the connection. Streamed requests are never coalesced.
+
+        Args:
+            endpoint (str): Endpoint relative to BASE_URL.
+            array_key (str): Key of the top-level array to stream, e.g. 'events'.
+            params (Optional[dict], optional): Query parameters. Defaults to None.
+            error_message (str, optional): Fallback error message when the server doesn't provide one.
+            cache (bool, optional): Use ResponseCache as `request` does. The body is written to the cache
+                while it's being streamed. Defaults to False.
+
+        Returns:
+            APIResponse: Decoded response.
+        """
+        # The span only covers the request. Reading and decoding the body happens while the caller iterates.
+        with Tracer.span("api", f"GET {endpoint}", streamed=True) as span:
+            request_headers = build_auth_headers()
+
+            cache_entry = ResponseCache.get(endpoint, params) if cache and not ResponseCache.bypass else None
+            if cache:
+                span.attrs["cache"] = "bypass" if ResponseCache.bypass else "miss"
+            if cache_entry:
+                if ResponseCache.is_fresh(cache_entry):
+                    span.attrs["cache"] = "hit"
+                    return APIResponse(
+                        is_success=True, body={array_key: iter_json_array(cache_entry.iter_body(), array_key)}
+                    )
+                request_headers.update(build_conditional_headers(cache_entry))
+
+            result, retry_count = cls.perform("GET", endpoint, params, None, request_headers, retry=True, stream=True)
+            if isinstance(result, APIResponse):
+                return result
+            resp = result
+
+            if resp.status_code == 401:
+                return reject_access_token(resp, retry_count)
+
+            if cache_entry and resp.status_code == 304:
+                span.attrs["cache"] = "revalidated"
+                resp.close()
+                ResponseCache.touch(cache_entry)
+                return APIResponse(
+                    is_success=True,
+                    body={array_key: iter_json_array(cache_entry.iter_body(), array_key)},
+                    retry_count=retry_count,
+                )
+
+            if not resp.ok:
+                return decode_response(resp, error_message, retry_count=retry_count)
+
+            cache_writer = None
+            if cache:
+                cache_writer = ResponseCache.open_writer(
+                    endpoint, params, etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified")
+                )
+            return APIResponse(
+                is_success=True,
+                body={array_key: iter_response_items(resp, array_key, cache_writer)},
+                retry_count=retry_count,
+            )
+
+    @classmethod
+    def perform(
+        cls,
+        method: str,
+        endpoint: str,
+        params: Optional[dict],
+        json: Optional[dict],
+        headers: dict,
+        retry: bool,
+        stream: bool = False,
+    ) -> Tuple[Union[requests.Response, APIResponse], int]:
+        """Send the HTTP request, retrying according to the policy.
+
+        Returns:
+            Tuple[Union[requests.Response, APIResponse], int]: The final HTTP response, or a failure APIResponse
+                if the server couldn't be reached, and the number of retries made.
+        """
+        policy = cls.policy
+        span = Tracer.current_span()
+        retry_count = 0
+        while True:
+            rate_limiter = cls.rate_limiter
+            if rate_limiter:
+                with span.phase("throttle"):
+                    rate_limiter.acquire()
+            started_at = time.perf_counter()
+            setup_seconds = span.phases.get("connect", 0.0) + span.phases.get("tls", 0.0)
+            try:
+                resp = cls.get_session().request(
+                    method=method,
+                    url=urljoin(BASE_URL, endpoint),
+                    params=params,
+                    json=json,
+                    headers=headers,
+                    timeout=policy.timeout,
+                    stream=stream,
+                )
+            except requests.Timeout:
+                if not retry or retry_count >= policy.max_retries:
+                    failure = APIResponse(
+                        is_success=False,
+                        error_message=TIMEOUT_ERROR_MESSAGE,
+                        retry_count=retry_count,
+                    )
+                    return failure, retry_count
+                delay = get_backoff_delay(policy, retry_count)
+            except requests.ConnectionError:
+                if not retry or retry_count >= policy.max_retries:
+                    failure = APIResponse(
+                        is_success=False,
+                        error_message=CONNECTION_ERROR_MESSAGE,
+                        retry_count=retry_count,
+                    )
+                    return failure, retry_count
+                delay = get_backoff_delay(policy, retry_count)
+            else:
+                if Tracer.enabled:
+                    trace_attempt(span, resp, started_at, setup_seconds, retry_count, stream)
+
+                retry_after = get_retry_after_delay(resp)
+                if rate_limiter:
+                    rate_limiter.observe(
+                        resp.status_code, min(retry_after, policy.retry_after_max) if retry_after else None
+                    )
+
+                # A 429 means the request was rejected without being processed, so it's safe to send it again
+                is_retryable = retry or resp.status_code == 429
+                if (
+                    not is_retryable
+                    or retry_count >= policy.max_retries
+                    or resp.status_code not in policy.retry_status_codes
+                ):
+                    return resp, retry_count
+
+                delay = retry_after
+                if delay is None:
+                    delay = get_backoff_delay(policy, retry_count)
+                elif delay > policy.retry_after_max:
+                    # Don't stall on a server asking us to come back much later
+                    return resp, retry_count
+                resp.close()
+
+            with span.phase("backoff"):
+                time.sleep(delay)
+            retry_count += 1
+
+    @classmethod
+    def get(cls, endpoint: str, params: Optional[dict] = None, **kwargs) -> APIResponse:
+        return cls.request("GET", endpoint, params=params, **kwargs)
+
+    @classmethod
+    def post(cls, endpoint: str, json: Optional[dict] = None, **kwargs) -> APIResponse:
+        return cls.request("POST", endpoint, json=json, **kwargs)
+
+    @classmethod
+    def put(cls, endpoint: str, json: Optional[dict] = None, **kwargs) -> APIResponse:
+        return cls.request("PUT", endpoint, json=json, **kwargs)
+
+    @classmethod
+    def patch(cls, endpoint: str, json: Optional[dict] = None, **kwargs) -> APIResponse:
+        return cls.request("PATCH", endpoint, json=json, **kwargs)
+
+    @classmethod
+    def delete(cls, endpoint: str, **kwargs) -> APIResponse:
+        return cls.request("DELETE", endpoint, **kwargs)
+
+
+class AsyncAPIClient:
+    """Awaitable access to the girok API for asyncio code such as the calendar TUI.
+
+    API calls run on a thread pool sized to APIClient's connection pool, so they share its keep-alive
+    connections, retry policy and response cache while the event loop stays free.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=API_POOL_MAXSIZE, thread_name_prefix="girok-api")
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func: Callable[..., APIResponse], *args, **kwargs) -> APIResponse:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def build_auth_headers() -> dict:
+    # AuthHandler depends on girok.api.auth, which is built on top of this module
+    from girok.config.auth_handler import AuthHandler
+
+    return {"Authorization": "Bearer " + AuthHandler.get_access_token()}
+
+
+def reject_access_token(resp: requests.Response, retry_count: int) -> APIResponse:
+    from girok.config.auth_handler import AuthHandler
+
+    resp.close()
+    AuthHandler.invalidate_access_token()
+    return APIResponse(
+        is_success=False,
+        error_message="Your session has expired. Please log in again with 'girok login'.",
+        retry_count=retry_count,
+    )
+
+
+def build_conditional_headers(cache_entry: CacheEntry) -> dict:
+    headers = {}
+    if cache_entry.etag:
+        headers["If-None-Match"] = cache_entry.etag
+    if cache_entry.last_modified:
+        headers["If-Modified-Since"] = cache_entry.last_modified
+    return headers
+
+
+def decode_cached_body(cache_entry: CacheEntry) -> Optional[dict]:
+    try:
+        return json.loads(cache_entry.read_body())
+    except (OSError, ValueError):
+        return None
+
+
+def iter_response_items(
+    resp: requests.Response, array_key: str, cache_writer: Optional[CacheWriter] = None
+) -> Iterator[dict]:
+    """Decode the items of a streamed body. Raises StreamError if the connection fails halfway through, and
+    ValueError if the body turns out to be malformed."""
+    chunks = resp.iter_content(chunk_size=API_STREAM_CHUNK_SIZE)
+    if cache_writer:
+        chunks = tee_to_cache(chunks, cache_writer)
+
+    try:
+        yield from iter_json_array(chunks, array_key)
+        # Drain the rest of the body so that the cache gets the whole document
+        for _ in chunks:
+            pass
+    except requests.RequestException as e:
+        # requests reports a read timeout in the middle of the body as a ConnectionError
+        is_timeout = isinstance(e, requests.Timeout) or any(isinstance(arg, ReadTimeoutError) for arg in e.args)
+        raise StreamError(TIMEOUT_ERROR_MESSAGE if is_timeout else CONNECTION_ERROR_MESSAGE) from e
+    finally:
+        if cache_writer:
+            chunks.close()
+        resp.close()
+
+
+def tee_to_cache(chunks: Iterator[bytes], cache_writer: CacheWriter) -> Iterator[bytes]:
+    is_complete = False
+    try:
+        for chunk in chunks:
+            cache_writer.write(chunk)
+            yield chunk
+        is_complete = True
+    finally:
+        if is_complete:
+            cache_writer.commit()
+        else:
+            cache_writer.discard()
+
+
+def store_response(endpoint: str, params: Optional[dict], resp: requests.Response) -> None:
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    ResponseCache.put(endpoint, params, resp.content, etag=etag, last_modified=last_modified)
+
+
+def trace_attempt(
+    span: Span, resp: requests.Response, started_at: float, setup_seconds: float, retry_count: int, stream: bool
+) -> None:
+    """Split the time of one attempt into waiting for the response headers and reading the body.
+
+    `resp.elapsed` runs until the headers are parsed, so it also covers connect / TLS, which the tracing
+    adapter records on its own.
+    """
+    setup_seconds = span.phases.get("connect", 0.0) + span.phases.get("tls", 0.0) - setup_seconds
+    elapsed = resp.elapsed.total_seconds()
+    span.add_phase("wait", max(0.0, elapsed - setup_seconds))
+    if not stream:
+        span.add_phase("read", max(0.0, time.perf_counter() - started_at - elapsed))
+    span.attrs["status"] = resp.status_code
+    content_length = resp.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        span.attrs["bytes"] = int(content_length)  # on the wire, i.e. compressed
+    elif not stream:
+        span.attrs["bytes"] = len(resp.content)
+    span.attrs["retries"] = retry_count
+
+
+def get_backoff_delay(policy: RequestPolicy, retry_count: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(policy.backoff_max, policy.backoff_base * (2**retry_count)))
+
+
+def get_retry_after_delay(resp: requests.Response) -> Optional[float]:
+    """Parse the `Retry-After` header, which is either delay-seconds or an HTTP-date."""
+    retry_after = resp.headers.get("Retry-After")
+    if not retry_after:
+        return None
+
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def decode_response(resp: requests.Response, error_message: str, retry_count: int = 0) -> APIResponse:
+    """Convert a `requests.Response` into an APIResponse.
+
+    Args:
+        resp (requests.Response): Raw HTTP response.
+        error_message (str): Fallback error message when the error body is not in the server's error format.
+        retry_count (int, optional): Number of retries made before getting this response. Defaults to 0.
+
+    Returns:
+        APIResponse: Success response carrying the JSON body (if any), or failure response carrying the error.
+    """
+    if resp.ok:
+        return APIResponse(is_success=True, body=decode_json_body(resp), retry_count=retry_count)
+
+    error_code = None
+    try:
+        error_body = resp.json()
+        error_code = error_body.get("errorCode")
+        error_message = error_body["message"]
+    except Exception:
+        pass
+
+    return APIResponse(is_success=False, error_message=error_message, error_code=error_code, retry_count=retry_count)
+
+
+def decode_json_body(resp: requests.Response) -> Optional[dict]:
+    if not resp.content:
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        return None
@@ -27,14 +27,14 @@ from textual.widgets import (
     Tree,
 )
 
-import girok.api.category as category_api
-import girok.api.task as task_api
+import girok.api.aio.category as category_api
+import girok.api.aio.task as task_api
 import girok.calendar_cli.utils as calendar_utils
 from girok.calendar_cli.sidebar import CategoryTree
 from girok.utils.time import get_year_and_month_by_month_offset
 from girok.constants import CALENDAR_HEADER_DATE_COLOR, CALENDAR_TODAY_COLOR, CALENDAR_WEEKDAY_NAME_COLOR
 from girok.calendar_cli.entity import Category
-from girok.commands.task.command import map_to_event_entities
+from girok.commands.task.command import sort_events
 from girok.commands.task.entity import Event
 from girok.utils.time import convert_iso_date_str_to_date_obj
 
@@ -197,6 +197,8 @@ class Calendar(Container):
     def on_key(self, event):
         if self.is_pop_up:
             return
+        if self.cur_focused_cell is None:  # Still loading
+            return
         x, y = self.cur_focused_cell_cord
         if event.key == "h":  # left
             next_cell_coord = (x, y - 1)
@@ -247,6 +249,8 @@ class Calendar(Container):
             self.is_pop_up = True
 
     def on_focus(self):
+        if self.cur_month_first_day_cell_num is None:  # Still loading
+            return
         x, y = calendar_utils.convert_cell_num_to_coord(
             self.cur_month_first_day_cell_num
         )
@@ -294,6 +298,11 @@ class Calendar(Container):
                 cell.mount(Label(day_text, id=f"cell-header-{i}"))
 
     def update_calendar(self, show_arrow=True):
+        # Fetching runs in a worker so the UI stays responsive. A newer update cancels the pending one,
+        # e.g. when the user flips through months quickly.
+        self.run_worker(self.load_calendar(show_arrow), group="update-calendar", exclusive=True)
+
+    async def load_calendar(self, show_arrow=True):
         """
         If val == "", then "root category" is selected
         """
@@ -315,10 +324,11 @@ class Calendar(Container):
         end_date = current_month_last_date.strftime("%Y-%m-%d")
 
         # Retrieve all events
-        resp = task_api.get_all_tasks(start_date=start_date, end_date=end_date, category_id=category_id, tags=tags, fetch_children=True)
+        resp = await task_api.get_all_tasks(start_date=start_date, end_date=end_date, category_id=category_id, tags=tags, fetch_children=True)
         if not resp.is_success:
-            exit(0)
-        self.events = map_to_event_entities(resp.body['events'])
+            self.app.exit(return_code=1, message=resp.error_message)
+            return
+        self.events = sort_events(resp.body['events'])
 
         # Empty out current calendar view
         self.refresh_cell_days()
@@ -334,6 +344,8 @@ class Calendar(Container):
             self.cur_focused_cell = self.query_one(f"#cell{first_weekday}")  # update
             if show_arrow:
                 calendar_utils.add_left_arrow(self.cur_focused_cell)
+        elif self.has_focus:  # Focused while the first month was still loading
+            self.on_focus()
 
         for idx, event in enumerate(self.events):
             target_days = event.get_all_days_for_month(self.year, self.month)
@@ -10,8 +10,8 @@ from textual.widgets import Button, Footer, Header, Label, Placeholder, Static,
 from textual.widgets._tree import TreeNode
 
 import girok.calendar_cli.utils as calendar_utils
-import girok.api.category as category_api
-import girok.api.task as task_api
+import girok.api.aio.category as category_api
+import girok.api.aio.task as task_api
 from girok.constants import CATEGORY_COLOR_PALETTE, Emoji
 from girok.calendar_cli.entity import Category
 
@@ -37,24 +37,25 @@ class CategoryTree(Tree):
         def __init__(self):
             super().__init__()
 
-    def on_mount(self):
+    async def on_mount(self):
         self.highlighted_node = self.root
         self.selected_node = self.root
         calendar_utils.add_left_arrow_tree(self.highlighted_node)
 
         self.line = 0
-        resp = category_api.get_all_categories()
+        resp = await category_api.get_all_categories()
         if not resp.is_success:
-            exit(0)
+            self.app.exit(return_code=1, message=resp.error_message)
+            return
         self.categories = resp.body['rootCategories']
         self.root.expand()
 
         for category in self.categories:
             top_cat = self.root.add(
-                category['name'], expand=True, data={"color": category['color'], "id": category['id']}
+                category.name, expand=True, data={"color": category.color, "id": category.id}
             )
             top_cat.allow_expand = True
-            calendar_utils.build_category_tree(top_cat, category['children'])
+            calendar_utils.build_category_tree(top_cat, category.children)
 
     def on_key(self, evt):
         if evt.key == "j":
@@ -117,16 +118,17 @@ class TagTree(Tree):
         def __init__(self):
             super().__init__()
 
-    def on_mount(self):
+    async def on_mount(self):
         self.select_node(self.root)
         self.action_select_cursor()
         self.highlighted_node = self.root
         self.selected_node = self.root
 
         # tags = task_api.get_tags()
-        resp = task_api.get_all_tags()
+        resp = await task_api.get_all_tags()
         if not resp.is_success:
-            exit(0)
+            self.app.exit(return_code=1, message=resp.error_message)
+            return
         self.tags = resp.body['tags']
         self.root.expand()
 
@@ -6,16 +6,17 @@ from rich.text import Text
 from textual import log
 from textual.widgets.tree import TreeNode
 
+from girok.api.entity import CategoryNode
 from girok.constants import Emoji
 
  
-def build_category_tree(tree_node: TreeNode, categories: list[dict]) -> None:
+def build_category_tree(tree_node: TreeNode, categories: list[CategoryNode]) -> None:
     for category in categories:
-        if not category['children']:
-            cur = tree_node.add_leaf(category['name'], data={"color": category['color'], 'id': category['id']})
+        if not category.children:
+            cur = tree_node.add_leaf(category.name, data={"color": category.color, 'id': category.id})
         else:
-            cur = tree_node.add(category['name'], expand=True, data={"color": category['color'], 'id': category['id']})
-            build_category_tree(cur, category['children'])
+            cur = tree_node.add(category.name, expand=True, data={"color": category.color, 'id': category.id})
+            build_category_tree(cur, category.children)
 
 
 def get_full_path_from_node(node):
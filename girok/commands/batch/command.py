@@ -0,0 +1,160 @@
+import shlex
+from typing import Dict, List, Optional, TextIO
+
+import click
+import typer
+from rich import box
+from rich.console import Console
+from rich.style import Style
+from rich.table import Column, Table
+from rich.text import Text
+from typing_extensions import Annotated
+
+import girok.api.category as category_api
+import girok.api.task as task_api
+from girok.api.bulk import BulkExecutor
+from girok.api.entity import APIResponse
+from girok.commands.batch.entity import BatchLine
+from girok.commands.task.callbacks import valid_workers_callback
+from girok.commands.task.command import build_task_fields
+from girok.constants import API_BULK_MAX_WORKERS, TABLE_HEADER_TEXT_COLOR, CommandName, DisplayBoxType
+from girok.utils.display import center_print
+
+app = typer.Typer(rich_markup_mode="rich")
+console = Console()
+
+# Commands a batch file may contain
+BATCH_COMMANDS = (CommandName.ADD_TASK,)
+
+
+@app.command(
+    "batch",
+    help="[yellow]Add[/yellow] many tasks at once from [yellow]addtask[/yellow] lines in a file, or stdin with '-'",
+    rich_help_panel=":fire: [bold yellow1]Task Commands[/bold yellow1]",
+)
+def batch(
+    ctx: typer.Context,
+    file: Annotated[typer.FileText, typer.Argument(help="File with one [yellow]addtask[/yellow] command per line")],
+    workers: Annotated[
+        int,
+        typer.Option(
+            "-w", "--workers", help="[yellow]Maximum parallel requests[/yellow]", callback=valid_workers_callback
+        ),
+    ] = API_BULK_MAX_WORKERS,
+):
+    """
+    Every line is an addtask command as it would be typed in the shell, with or without the leading 'girok'.
+    Blank lines and lines starting with '#' are skipped.
+
+    1. Parse and validate every line. If any line is invalid, nothing is run.
+    2. Resolve each distinct category path once.
+    3. Create the tasks concurrently, then report the result of every line.
+    """
+    lines = read_batch_lines(file)
+    if not lines:
+        center_print("There are no commands to run.", DisplayBoxType.WARNING)
+        raise typer.Exit()
+
+    for line in lines:
+        parse_batch_line(ctx, line)
+
+    invalid_lines = [line for line in lines if line.error is not None]
+    if invalid_lines:
+        display_batch_results(invalid_lines)
+        center_print(f"{len(invalid_lines)} of {len(lines)} lines are invalid. Nothing was run.", DisplayBoxType.ERROR)
+        raise typer.Exit(1)
+
+    executor = BulkExecutor(max_workers=workers)
+    category_ids = resolve_category_paths(executor, {line.category_path for line in lines})
+
+    runnable_lines = []
+    for line in lines:
+        resp = category_ids[line.category_path]
+        if resp.is_success:
+            line.task_fields["category_id"] = resp.body["categoryId"]
+            runnable_lines.append(line)
+        else:
+            line.error = resp.error_message
+
+    responses = executor.map(lambda line: task_api.create_task_in_category(**line.task_fields), runnable_lines)
+    for line, resp in zip(runnable_lines, responses):
+        if resp.is_success:
+            line.event_id = resp.body["eventId"]
+        else:
+            line.error = resp.error_message
+
+    display_batch_results(lines)
+    failed_count = sum(1 for line in lines if line.error is not None)
+    if failed_count:
+        center_print(f"Created {len(lines) - failed_count} of {len(lines)} tasks.", DisplayBoxType.ERROR)
+        raise typer.Exit(1)
+    center_print(f"Created {len(lines)} tasks.", DisplayBoxType.SUCCESS)
+
+
+def read_batch_lines(file: TextIO) -> List[BatchLine]:
+    lines = []
+    for line_no, text in enumerate(file, start=1):
+        text = text.strip()
+        if text and not text.startswith("#"):
+            lines.append(BatchLine(line_no=line_no, text=text))
+    return lines
+
+
+def parse_batch_line(ctx: typer.Context, line: BatchLine) -> None:
+    """Run the line through addtask's own parser and callbacks, without invoking the command."""
+    try:
+        args = shlex.split(line.text)
+    except ValueError as e:
+        line.error = str(e)
+        return
+
+    if args and args[0] == "girok":
+        args = args[1:]
+    if not args or args[0] not in BATCH_COMMANDS:
+        line.error = f"Only {', '.join(repr(c) for c in BATCH_COMMANDS)} commands can be run in a batch."
+        return
+    if "--help" in args:
+        line.error = "'--help' can't be used in a batch."
+        return
+
+    group_ctx = ctx.find_root()
+    command = group_ctx.command.get_command(group_ctx, args[0])
+    try:
+        params = command.make_context(args[0], args[1:], parent=ctx).params
+        task_fields = build_task_fields(
+            params["start_datetime"], params["end_datetime"], params["repetition"], params["tags"]
+        )
+    except click.ClickException as e:
+        line.error = e.format_message()
+        return
+
+    line.category_path = params["category_path"]
+    line.task_fields = dict(task_fields, name=params["name"], priority=params["priority"], memo=params["memo"])
+
+
+def resolve_category_paths(executor: BulkExecutor, category_paths: set) -> Dict[Optional[str], APIResponse]:
+    def resolve(category_path: Optional[str]) -> APIResponse:
+        # None (no -c) and '' (-c /) both mean no category, as in task_api.create_task
+        if not category_path:
+            return APIResponse(is_success=True, body={"categoryId": None})
+        return category_api.get_category_id_by_path(category_path.split("/"))
+
+    category_paths = list(category_paths)
+    return dict(zip(category_paths, executor.map(resolve, category_paths)))
+
+
+def display_batch_results(lines: List[BatchLine]) -> None:
+    table = Table(
+        Column("Line", justify="right"),
+        Column("Command"),
+        Column("Result"),
+        box=box.SIMPLE_HEAD,
+        header_style=Style(color=TABLE_HEADER_TEXT_COLOR),
+    )
+    for line in lines:
+        if line.error is not None:
+            result = Text(line.error, style="red")
+        else:
+            result = Text.assemble(("Created", "green"), f" (id {line.event_id})")
+        table.add_row(str(line.line_no), Text(line.text), result)
+    console.print(table)
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class BatchLine:
+    line_no: int
+    text: str
+    category_path: Optional[str] = None
+    task_fields: Optional[dict] = None  # keyword arguments of task_api.create_task_in_category
+    event_id: Optional[int] = None
+    error: Optional[str] = None
@@ -1,5 +1,7 @@
 import typer
-import girok.calendar_cli.calendar_main as calendar_main
+from typing_extensions import Annotated
+
+from girok.api.response_cache import ResponseCache
 
 app = typer.Typer(rich_markup_mode="rich")
 
@@ -9,6 +11,16 @@ app = typer.Typer(rich_markup_mode="rich")
     help="[green]Open Calendar GUI[/green]",
     rich_help_panel=":tear-off_calendar: [bold yellow1]Calendar Commands[/bold yellow1]"
 )
-def show_calendar():
+def show_calendar(
+    fresh: Annotated[
+        bool, typer.Option("--fresh", help="[yellow]Bypass the local cache[/yellow] and fetch data from the server")
+    ] = False,
+):
+    if fresh:
+        ResponseCache.configure(bypass=True)
+
+    # textual is only needed by this command, so it's imported here rather than at startup
+    import girok.calendar_cli.calendar_main as calendar_main
+
     cal_app = calendar_main.Entry()
-    cal_app.run()
\ No newline at end of file
+    cal_app.run()
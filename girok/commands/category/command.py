@@ -1,4 +1,5 @@
 import re
+from typing import Dict, List, Optional, Tuple
 
 import typer
 from rich import print
@@ -10,12 +11,19 @@ from rich.tree import Tree
 from typing_extensions import Annotated
 
 import girok.api.category as category_api
+import girok.api.task as task_api
+from girok.api.bulk import BulkExecutor
+from girok.api.entity import APIResponse, CategoryNode, StreamError
+from girok.api.response_cache import ResponseCache
 from girok.commands.category.util import (
+    count_tasks_by_category,
     display_categories_tree,
     display_category_color_palette,
     get_next_category_color,
 )
+from girok.commands.task.callbacks import valid_workers_callback
 from girok.constants import (
+    API_BULK_MAX_WORKERS,
     CATEGORY_COLOR_PALETTE,
     DEFAULT_CATEGORY_TEXT_COLOR,
     DisplayArrowType,
@@ -27,6 +35,12 @@ from girok.utils.display import arrow_print, center_print
 app = typer.Typer(rich_markup_mode="rich")
 console = Console()
 
+# `-w` of the commands that change many categories at once
+WorkersOption = Annotated[
+    int,
+    typer.Option("-w", "--workers", help="[yellow]Maximum parallel requests[/yellow]", callback=valid_workers_callback),
+]
+
 
 def category_callback(ctx: typer.Context, param: typer.CallbackParam, value: str):
     if value is None:
@@ -51,15 +65,46 @@ def category_callback(ctx: typer.Context, param: typer.CallbackParam, value: str
     help="[yellow]Show[/yellow] all pre-defined categories",
     rich_help_panel=":file_folder: [bold yellow1]Category Commands[/bold yellow1]",
 )
-def show_categories():
+def show_categories(
+    fresh: Annotated[
+        bool,
+        typer.Option("--fresh", help="[yellow]Bypass the local cache[/yellow] and fetch categories from the server"),
+    ] = False,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "-s", "--stats", help="[yellow]Show open, overdue and due-this-week task counts[/yellow] of each category"
+        ),
+    ] = False,
+):
+    if fresh:
+        ResponseCache.configure(bypass=True)
+
     resp = category_api.get_all_categories()
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
+    root_categories: list[CategoryNode] = resp.body["rootCategories"]
+
+    task_counts = None
+    if stats:
+        # A single request for every task; counts are rolled up from each task's category path
+        resp = task_api.get_all_tasks(fetch_children=True, stream=True)
+        if not resp.is_success:
+            center_print(resp.error_message, DisplayBoxType.ERROR)
+            raise typer.Exit()
+        try:
+            task_counts = count_tasks_by_category(resp.body["events"])
+        except StreamError as e:
+            center_print(str(e), DisplayBoxType.ERROR)
+            raise typer.Exit()
+        except ValueError as e:
+            # A streamed body can only turn out to be malformed while it's being consumed
+            center_print(f"Unexpected response from the server ({e})", DisplayBoxType.ERROR)
+            raise typer.Exit()
 
     center_print("Event Categories", DisplayBoxType.TITLE)
-    root_categories: list[dict] = resp.body["rootCategories"]
-    display_categories_tree(root_categories)
+    display_categories_tree(root_categories, task_counts=task_counts)
 
 
 @app.command(
@@ -77,17 +122,20 @@ def add_category(
         ),
     ],
     color: Annotated[str, typer.Option("-c", "--color", help="[yellow]Color[/yellow] for category")] = None,
+    parents: Annotated[
+        bool, typer.Option("-p", "--parents", help="[yellow]Create missing parent categories[/yellow] as needed")
+    ] = False,
 ):
+    if parents:
+        add_category_with_parents(category_path, color)
+        return
+
     # Resolve color
     if color:
         if len(category_path.split("/")) != 1:
             arrow_print("You cannot specify non top-level category color", DisplayArrowType.ERROR)
             raise typer.Exit()
-
-        if color not in CATEGORY_COLOR_PALETTE:
-            arrow_print("Unsupported category color\n", DisplayArrowType.ERROR)
-            display_category_color_palette()
-            raise typer.Exit()
+        validate_category_color(color)
     else:
         # If color is not passed and top-level category, automatically assign the color from the palette
         if len(category_path.split("/")) == 1:
@@ -109,107 +157,183 @@ def add_category(
         raise typer.Exit()
 
     center_print("Event Categories", DisplayBoxType.TITLE)
-    root_categories: list[dict] = resp.body["rootCategories"]
+    root_categories: list[CategoryNode] = resp.body["rootCategories"]
+    display_categories_tree(root_categories, category_path)
+
+
+def add_category_with_parents(category_path: str, color: Optional[str]) -> None:
+    """Create the category and every missing parent, worked out from one snapshot of the tree."""
+    resp = category_api.get_all_categories()
+    if not resp.is_success:
+        center_print(resp.error_message, DisplayBoxType.ERROR)
+        raise typer.Exit()
+
+    root_categories: list[CategoryNode] = resp.body["rootCategories"]
+    path_list = category_path.split("/")
+    _, existing_depth = category_api.find_deepest_category(root_categories, path_list)
+
+    if existing_depth == len(path_list):
+        arrow_print(f"'{category_path}' already exists", DisplayArrowType.INFO)
+    else:
+        # Only a new top-level category takes a color
+        if color:
+            if existing_depth > 0:
+                arrow_print("You cannot specify non top-level category color", DisplayArrowType.ERROR)
+                raise typer.Exit()
+            validate_category_color(color)
+        elif existing_depth == 0:
+            color = get_next_category_color()
+
+        resp = category_api.create_missing_categories(path_list, root_categories, color)
+        if not resp.is_success:
+            center_print(resp.error_message, DisplayBoxType.ERROR)
+            if resp.body and resp.body["created"]:
+                arrow_print(f"Created before the failure: {', '.join(resp.body['created'])}", DisplayArrowType.INFO)
+            raise typer.Exit()
+
+        # Served from the cached tree, which the creations above were applied to
+        resp = category_api.get_all_categories()
+        if not resp.is_success:
+            center_print(resp.error_message, DisplayBoxType.ERROR)
+            raise typer.Exit()
+        root_categories = resp.body["rootCategories"]
+
+    center_print("Event Categories", DisplayBoxType.TITLE)
     display_categories_tree(root_categories, category_path)
 
 
+def validate_category_color(color: str) -> None:
+    if color not in CATEGORY_COLOR_PALETTE:
+        arrow_print("Unsupported category color\n", DisplayArrowType.ERROR)
+        display_category_color_palette()
+        raise typer.Exit()
+
+
+def category_patterns_callback(ctx: typer.Context, param: typer.CallbackParam, values: List[str]):
+    """Like `category_callback`, for several paths that may contain fnmatch wildcards ('*', '?', '[...]')."""
+    patterns = []
+    for value in values:
+        if not re.match(r"^([a-zA-Z0-9*?\[\]!-]+/)*[a-zA-Z0-9*?\[\]!-]+/?$", value):
+            raise typer.BadParameter("[Invalid category path] Category path must be in 'xx/yy/zz format.'")
+
+        if value.endswith("/"):
+            value = value[:-1]
+
+        if value == "none":
+            raise typer.BadParameter("Sorry, 'none' is a reserved category name.")
+        patterns.append(value)
+    return patterns
+
+
 @app.command(
     "rmcat",
-    help="[red]Remove[/red] a category",
+    help="[red]Remove[/red] categories, given as paths or patterns such as 'Archive/2023/*'",
     rich_help_panel=":file_folder: [bold yellow1]Category Commands[/bold yellow1]",
 )
 def remove_category(
-    category_path: Annotated[
-        str,
+    category_paths: Annotated[
+        List[str],
         typer.Argument(
             ...,
-            help="[yellow]Category path - xx/yy/zz..[/yellow]",
-            callback=category_callback,
+            help="[yellow]Category paths - xx/yy/zz..[/yellow]",
+            callback=category_patterns_callback,
         ),
     ],
     force_yes: Annotated[bool, typer.Option("-y", "--yes", help="[yellow]Ignore confirm message[/yellow]")] = False,
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", help="[yellow]Only show the categories[/yellow] that would be removed")
+    ] = False,
+    workers: WorkersOption = API_BULK_MAX_WORKERS,
 ):
+    # Subcategories are removed along with their parent
+    _, targets = resolve_category_targets(category_paths)
+    targets = drop_nested_targets(targets)
+    if dry_run:
+        display_dry_run([f"Remove '{path}'" for path, _ in targets])
+        raise typer.Exit()
+
     if not force_yes:
+        target_paths = ", ".join(f"'{path}'" for path, _ in targets)
         confirm_rm = typer.confirm(
-            f"[WARNING] Are you sure to delete '{category_path}'?\nAll the subcategories and tasks will also be deleted."
+            f"[WARNING] Are you sure to delete {target_paths}?\nAll the subcategories and tasks will also be deleted."
         )
         if not confirm_rm:
             raise typer.Exit()
 
-    resp = category_api.remove_category(category_path)
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
-        raise typer.Exit()
-
-    resp = category_api.get_all_categories()
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
-        raise typer.Exit()
-
-    center_print("Event Categories", DisplayBoxType.TITLE)
-    root_categories: list[dict] = resp.body["rootCategories"]
-    display_categories_tree(root_categories, category_path)
+    responses = BulkExecutor(max_workers=workers).map(
+        lambda target: category_api.remove_category_by_id(target[1].id, target[0].split("/")), targets
+    )
+    display_category_mutation_results(targets, responses, "Removed", highlight_category_path=targets[0][0])
 
 
 @app.command(
     "upcat",
-    help="[green]Rename[/green] a category",
+    help="[green]Rename[/green] or recolor categories, given as paths or patterns such as 'Archive/2023/*'",
     rich_help_panel=":file_folder: [bold yellow1]Category Commands[/bold yellow1]",
 )
 def rename_category(
-    category_path: Annotated[
-        str,
+    category_paths: Annotated[
+        List[str],
         typer.Argument(
-            help="[yellow]Category path - xx/yy/zz..[/yellow]",
-            callback=category_callback,
+            help="[yellow]Category paths - xx/yy/zz..[/yellow]",
+            callback=category_patterns_callback,
         ),
     ],
     new_name: Annotated[str, typer.Option("-n", "--name", help="[yellow]New category name[/yellow]")] = None,
     new_color: Annotated[str, typer.Option("-c", "--color", help="[yellow]New category color[/yellow]")] = None,
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", help="[yellow]Only show the categories[/yellow] that would be updated")
+    ] = False,
+    workers: WorkersOption = API_BULK_MAX_WORKERS,
 ):
     if new_name is None and new_color is None:
         arrow_print("Please provide fields to update", DisplayArrowType.ERROR)
         raise typer.Exit()
 
+    _, targets = resolve_category_targets(category_paths)
+
     # Resolve color
     if new_color:
-        if len(category_path.split("/")) != 1:
+        if any("/" in path for path, _ in targets):
             arrow_print("You cannot update non top-level category color", DisplayArrowType.ERROR)
             raise typer.Exit()
 
-        if new_color not in CATEGORY_COLOR_PALETTE:
-            arrow_print("Unsupported category color\n", DisplayArrowType.ERROR)
-            display_category_color_palette()
-            raise typer.Exit()
+        validate_category_color(new_color)
 
-    resp = category_api.update_category(category_path, new_name, new_color)
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
+    new_paths = []
+    for path, _ in targets:
+        name = new_name if new_name else path.split("/")[-1]
+        new_paths.append("/".join(path.split("/")[:-1] + [name]))
+    if len(set(new_paths)) < len(new_paths):
+        arrow_print("Categories under the same parent cannot get the same name", DisplayArrowType.ERROR)
         raise typer.Exit()
 
-    resp = category_api.get_all_categories()
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
+    if dry_run:
+        changes = []
+        for (path, _), new_path in zip(targets, new_paths):
+            change = f"Rename '{path}' to '{new_path}'" if new_name else f"Update '{path}'"
+            changes.append(f"{change} with color {new_color}" if new_color else change)
+        display_dry_run(changes)
         raise typer.Exit()
 
-    center_print("Event Categories", DisplayBoxType.TITLE)
-    root_categories: list[dict] = resp.body["rootCategories"]
-    name = new_name if new_name else category_path.split("/")[-1]
-    new_path = "/".join(category_path.split("/")[:-1] + [name])
-    display_categories_tree(root_categories, new_path)
+    responses = BulkExecutor(max_workers=workers).map(
+        lambda target: category_api.update_category_by_id(target[1].id, target[0].split("/"), new_name, new_color),
+        targets,
+    )
+    display_category_mutation_results(targets, responses, "Updated", highlight_category_path=new_paths[0])
 
 
 @app.command(
     "mvcat",
-    help="[yellow]Move[/yellow] a category to under category",
+    help="[yellow]Move[/yellow] categories, given as paths or patterns such as 'Archive/2023/*', to under category",
     rich_help_panel=":file_folder: [bold yellow1]Category Commands[/bold yellow1]",
 )
 def move_category(
-    path: Annotated[
-        str,
+    paths: Annotated[
+        List[str],
         typer.Argument(
-            help="[yellow]Category path - xx/yy/zz..[/yellow]",
-            callback=category_callback,
+            help="[yellow]Category paths - xx/yy/zz..[/yellow]",
+            callback=category_patterns_callback,
         ),
     ],
     new_parent_path: Annotated[
@@ -219,21 +343,110 @@ def move_category(
             callback=category_callback,
         ),
     ],
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", help="[yellow]Only show the categories[/yellow] that would be moved")
+    ] = False,
+    workers: WorkersOption = API_BULK_MAX_WORKERS,
 ):
-    resp = category_api.move_category(path, new_parent_path)
+    # Subcategories move along with their parent
+    root_categories, targets = resolve_category_targets(paths)
+    targets = drop_nested_targets(targets)
+
+    # The new parent is resolved against the same snapshot as the categories
+    new_parent_path_list = new_parent_path.split("/") if new_parent_path else []
+    new_parent, depth = category_api.find_deepest_category(root_categories, new_parent_path_list)
+    if depth < len(new_parent_path_list):
+        center_print(f"There is no category '{new_parent_path}'", DisplayBoxType.ERROR)
+        raise typer.Exit()
+    new_parent_category_id = new_parent.id if new_parent is not None else None
+
+    for path, _ in targets:
+        if f"{new_parent_path}/".startswith(f"{path}/"):
+            arrow_print(f"You cannot move '{path}' to under itself", DisplayArrowType.ERROR)
+            raise typer.Exit()
+
+    new_paths = ["/".join(new_parent_path_list + [path.split("/")[-1]]) for path, _ in targets]
+    if dry_run:
+        display_dry_run([f"Move '{path}' to '{new_path}'" for (path, _), new_path in zip(targets, new_paths)])
+        raise typer.Exit()
+
+    responses = BulkExecutor(max_workers=workers).map(
+        lambda target: category_api.move_category_by_id(
+            target[1].id, target[0].split("/"), new_parent_category_id, new_parent_path_list
+        ),
+        targets,
+    )
+    display_category_mutation_results(targets, responses, "Moved", highlight_category_path=new_paths[0])
+
+
+def resolve_category_targets(patterns: List[str]) -> Tuple[list[CategoryNode], List[Tuple[str, CategoryNode]]]:
+    """Expand the paths and patterns against one snapshot of the tree. A category matched twice is kept once.
+
+    Returns:
+        Tuple[list[CategoryNode], List[Tuple[str, CategoryNode]]]: The snapshot, and (path, category) of every match.
+    """
+    resp = category_api.get_all_categories()
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
 
+    root_categories: list[CategoryNode] = resp.body["rootCategories"]
+    targets: Dict[str, CategoryNode] = {}
+    for pattern in patterns:
+        matches = category_api.match_category_paths(root_categories, pattern)
+        if not matches:
+            center_print(f"There is no category matching '{pattern}'", DisplayBoxType.ERROR)
+            raise typer.Exit()
+        targets.update(matches)
+    return root_categories, list(targets.items())
+
+
+def drop_nested_targets(targets: List[Tuple[str, CategoryNode]]) -> List[Tuple[str, CategoryNode]]:
+    """Drop the targets that are subcategories of another target."""
+    target_paths = {path for path, _ in targets}
+
+    def is_nested(path: str) -> bool:
+        path_list = path.split("/")
+        return any("/".join(path_list[:depth]) in target_paths for depth in range(1, len(path_list)))
+
+    return [(path, category) for path, category in targets if not is_nested(path)]
+
+
+def display_dry_run(changes: List[str]) -> None:
+    for change in changes:
+        arrow_print(change, DisplayArrowType.INFO)
+    center_print(f"Dry run: {len(changes)} categories would be changed. Nothing was changed.", DisplayBoxType.WARNING)
+
+
+def display_category_mutation_results(
+    targets: List[Tuple[str, CategoryNode]],
+    responses: List[APIResponse],
+    action: str,
+    highlight_category_path: str,
+) -> None:
+    """Report failed mutations, then redraw the tree once. A single category is highlighted in the tree."""
+    failed = [(path, resp) for (path, _), resp in zip(targets, responses) if not resp.is_success]
+    if len(targets) == 1 and failed:
+        center_print(failed[0][1].error_message, DisplayBoxType.ERROR)
+        raise typer.Exit()
+    for path, resp in failed:
+        arrow_print(f"'{path}': {resp.error_message}", DisplayArrowType.ERROR)
+
+    # Served from the cached tree, which the mutations above were applied to
     resp = category_api.get_all_categories()
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
 
     center_print("Event Categories", DisplayBoxType.TITLE)
-    root_categories: list[dict] = resp.body["rootCategories"]
-    new_path = "/".join(new_parent_path.split("/") + [path.split("/")[-1]])
-    display_categories_tree(root_categories, new_path)
+    root_categories: list[CategoryNode] = resp.body["rootCategories"]
+    display_categories_tree(root_categories, highlight_category_path if len(targets) == 1 else None)
+
+    if len(targets) > 1:
+        if failed:
+            center_print(f"{action} {len(targets) - len(failed)} of {len(targets)} categories.", DisplayBoxType.ERROR)
+        else:
+            center_print(f"{action} {len(targets)} categories.", DisplayBoxType.SUCCESS)
 
 
 @app.command(
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TaskCounts:
+    """Tasks of a category and all of its subcategories."""
+
+    __slots__ = ("open", "overdue", "due_this_week")
+
+    open: int
+    overdue: int
+    due_this_week: int
@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
 
 from rich import print
 from rich.console import Console
@@ -6,26 +7,37 @@ from rich.style import Style
 from rich.text import Text
 from rich.tree import Tree
 
+from girok.api.entity import CategoryNode
+from girok.commands.category.entity import TaskCounts
+from girok.commands.task.entity import Event
+from girok.config.config_store import ConfigStore
 from girok.constants import (
     CATEGORY_COLOR_AUTO_ASSIGNMENT_ORDER,
     CATEGORY_COLOR_PALETTE,
-    CONFIG_PATH,
     DEFAULT_CATEGORY_TEXT_COLOR,
     HIGHLIGHT_CATEGORY_TEXT_COLOR,
+    TASK_DUE_THIS_WEEK_TEXT_COLOR,
+    TASK_OVERDUE_TEXT_COLOR,
     DisplayBoxType,
     Emoji,
 )
-from girok.utils.json_utils import read_json, update_json
+from girok.utils.trace import traced_stage
 
 console = Console()
 
 
-def display_categories_tree(root_categories: list[dict], highlight_category_path: Optional[str] = None):
+@traced_stage("render category tree")
+def display_categories_tree(
+    root_categories: list[CategoryNode],
+    highlight_category_path: Optional[str] = None,
+    task_counts: Optional[Dict[int, TaskCounts]] = None,
+):
     """Display the category tree
 
     Args:
-        root_categories (list[dict]): List of top-level categories.
+        root_categories (list[CategoryNode]): List of top-level categories.
         highlight_category_path (Optional[str], optional): Category path name to be highlighted. Must be in 'A/B/C' format. Defaults to None.
+        task_counts (Optional[Dict[int, TaskCounts]], optional): Task counts by category id, shown next to each category. Defaults to None.
     """
     tree = Tree("")
 
@@ -34,27 +46,30 @@ def display_categories_tree(root_categories: list[dict], highlight_category_path
             tree=tree,
             category=category,
             highlight_category_path=highlight_category_path,
+            task_counts=task_counts,
         )
     console.print(tree)
 
 
 def display_category_subtree(
     tree: Tree,
-    category: dict,
+    category: CategoryNode,
     highlight_category_path: Optional[str] = None,
     parent_cumul_path: str = "",
+    task_counts: Optional[Dict[int, TaskCounts]] = None,
 ):
     """Display the subtree of a single tree node.
 
     Args:
         tree (Tree): rich.tree.Tree object.
-        category (dict): A single category. It's a dictionary with keys 'id', 'name', 'color', 'children'
+        category (CategoryNode): A single category.
         highlight_category_path (Optional[str], optional): Category path name to be highlighted. Must be in 'A/B/C' format. Defaults to None.
         parent_cumul_path (str, optional): The cumulative category path string of the current node's parent. Defaults to "".
+        task_counts (Optional[Dict[int, TaskCounts]], optional): Task counts by category id, shown next to each category. Defaults to None.
     """
-    category_name = category["name"]
-    category_color = category["color"]
-    category_children = category["children"]
+    category_name = category.name
+    category_color = category.color
+    category_children = category.children
     current_category_path = f"{parent_cumul_path}/{category_name}".lstrip("/")  # A/B/C
 
     circle_text = Text(text=Emoji.CIRCLE, style=Style(color=CATEGORY_COLOR_PALETTE[category_color]))
@@ -71,6 +86,8 @@ def display_category_subtree(
     )
 
     item_text = Text.assemble(circle_text, " ", category_name_text)
+    if task_counts is not None and category.id in task_counts:
+        item_text.append_text(build_task_counts_text(task_counts[category.id]))
     sub_tree = tree.add(item_text)
     for child in category_children:
         display_category_subtree(
@@ -78,9 +95,44 @@ def display_category_subtree(
             category=child,
             highlight_category_path=highlight_category_path,
             parent_cumul_path=current_category_path,
+            task_counts=task_counts,
         )
 
 
+def build_task_counts_text(counts: TaskCounts) -> Text:
+    text = Text.assemble("  ", (f"{counts.open} open", Style(color=DEFAULT_CATEGORY_TEXT_COLOR, dim=True)))
+    if counts.overdue:
+        text.append(f" · {counts.overdue} overdue", style=Style(color=TASK_OVERDUE_TEXT_COLOR))
+    if counts.due_this_week:
+        text.append(f" · {counts.due_this_week} this week", style=Style(color=TASK_DUE_THIS_WEEK_TEXT_COLOR))
+    return text
+
+
+@traced_stage("count tasks by category")
+def count_tasks_by_category(events: Iterable[Event]) -> Dict[int, TaskCounts]:
+    """Count open, overdue and due-this-week tasks of every category in one pass over the events.
+
+    An event's category path lists all of its ancestors, so counting the event once for each of them rolls the
+    counts up through the tree. The week runs from today to Sunday. Categories without tasks are left out.
+    """
+    today = date.today()
+    sunday = today + timedelta(days=6 - today.weekday())
+
+    task_counts: Dict[int, TaskCounts] = {}
+    for event in events:
+        due_date = event.get_due_date(today)
+        is_overdue = due_date is None or due_date < today
+        is_due_this_week = not is_overdue and due_date <= sunday
+        for category in event.category_path:
+            counts = task_counts.get(category.id)
+            if counts is None:
+                counts = task_counts[category.id] = TaskCounts(open=0, overdue=0, due_this_week=0)
+            counts.open += 1
+            counts.overdue += is_overdue
+            counts.due_this_week += is_due_this_week
+    return task_counts
+
+
 def display_category_color_palette() -> None:
     tree = Tree("Supported category colors")
     for color_name, hex in CATEGORY_COLOR_PALETTE.items():
@@ -92,14 +144,15 @@ def display_category_color_palette() -> None:
 
 
 def get_next_category_color() -> str:
-    cfg = read_json(CONFIG_PATH)
+    next_category_color = None
 
-    if "next_category_color_idx" in cfg:
-        next_category_color_idx = cfg["next_category_color_idx"]
-    else:
-        next_category_color_idx = 0
+    def take_next_color(cfg: dict) -> dict:
+        # Runs under config.json's lock, so parallel 'addcat's get distinct colors
+        nonlocal next_category_color
+        next_category_color_idx = cfg.get("next_category_color_idx", 0)
+        next_category_color = CATEGORY_COLOR_AUTO_ASSIGNMENT_ORDER[next_category_color_idx]
+        next_category_color_idx = (next_category_color_idx + 1) % len(CATEGORY_COLOR_AUTO_ASSIGNMENT_ORDER)
+        return {**cfg, "next_category_color_idx": next_category_color_idx}
 
-    next_category_color = CATEGORY_COLOR_AUTO_ASSIGNMENT_ORDER[next_category_color_idx]
-    next_category_color_idx = (next_category_color_idx + 1) % len(CATEGORY_COLOR_AUTO_ASSIGNMENT_ORDER)
-    update_json(CONFIG_PATH, {"next_category_color_idx": next_category_color_idx})
+    ConfigStore.modify(take_next_color)
     return next_category_color
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import time
+from enum import Enum
+
+import typer
+from typing_extensions import Annotated
+
+from girok.constants import APP_DIR, DAEMON_LOG_PATH, DAEMON_START_TIMEOUT, DisplayBoxType
+from girok.daemon.client import request_daemon
+from girok.daemon.protocol import DAEMON_COMMANDS, get_socket_path, is_supported
+from girok.utils.display import center_print
+
+app = typer.Typer(rich_markup_mode="rich")
+
+
+class DaemonAction(str, Enum):
+    START = "start"
+    STOP = "stop"
+    STATUS = "status"
+
+
+@app.command(
+    "daemon",
+    help="[green]Start, stop or check[/green] the background daemon that serves commands from a warm process",
+    rich_help_panel=":gear: [bold yellow1]Utility Commands[/bold yellow1]",
+)
+def daemon(
+    action: Annotated[
+        DaemonAction,
+        typer.Argument(help="[yellow]start[/yellow], [yellow]stop[/yellow] or [yellow]status[/yellow]"),
+    ],
+):
+    if not is_supported():
+        center_print("The daemon needs Unix domain sockets, which this platform doesn't support.", DisplayBoxType.ERROR)
+        raise typer.Exit(1)
+
+    if action == DaemonAction.START:
+        start_daemon()
+    elif action == DaemonAction.STOP:
+        stop_daemon()
+    else:
+        show_daemon_status()
+
+
+def start_daemon() -> None:
+    if request_daemon("status") is not None:
+        center_print("The daemon is already running.", DisplayBoxType.SUCCESS)
+        return
+
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    # The daemon writes to the client's terminal, but rich picks its color system when a Console is created,
+    # which happens in the daemon before any terminal is attached.
+    if "NO_COLOR" not in env:
+        env["FORCE_COLOR"] = "1"
+    # The terminal size is read from the client's file descriptors for every command instead
+    env.pop("COLUMNS", None)
+    env.pop("LINES", None)
+
+    os.makedirs(APP_DIR, exist_ok=True)
+    with open(DAEMON_LOG_PATH, "ab") as log_file:
+        subprocess.Popen(
+            [sys.executable, "-m", "girok.daemon.server"],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            env=env,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = request_daemon("status")
+        if status is not None:
+            center_print(f"The daemon is running (pid {status['pid']}).", DisplayBoxType.SUCCESS)
+            return
+        time.sleep(0.05)
+
+    center_print(f"The daemon didn't start. See {DAEMON_LOG_PATH} for details.", DisplayBoxType.ERROR)
+    raise typer.Exit(1)
+
+
+def stop_daemon() -> None:
+    reply = request_daemon("stop")
+    if reply is None:
+        center_print("The daemon is not running.", DisplayBoxType.ERROR)
+        return
+    center_print(f"The daemon (pid {reply['pid']}) stopped.", DisplayBoxType.SUCCESS)
+
+
+def show_daemon_status() -> None:
+    status = request_daemon("status")
+    if status is None:
+        center_print("The daemon is not running.", DisplayBoxType.ERROR)
+        return
+
+    uptime_min = int(status["uptime"] // 60)
+    center_print(
+        f"The daemon is running (pid {status['pid']}, up {uptime_min} min, "
+        f"{status['commands_served']} commands served) on {get_socket_path()}.",
+        DisplayBoxType.SUCCESS,
+    )
+    center_print(f"Commands it serves: {', '.join(sorted(DAEMON_COMMANDS))}", DisplayBoxType.SUCCESS)
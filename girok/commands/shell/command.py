@@ -0,0 +1,101 @@
+import os
+import shlex
+
+import typer
+from rich import print
+
+from girok.api_client import APIClient
+from girok.constants import (
+    APP_DIR,
+    SHELL_COALESCE_WINDOW,
+    SHELL_HISTORY_LENGTH,
+    SHELL_HISTORY_PATH,
+    CommandName,
+    DisplayBoxType,
+)
+from girok.utils.display import center_print
+
+app = typer.Typer(rich_markup_mode="rich")
+
+EXIT_COMMANDS = ("exit", "quit")
+PROMPT = "girok> "
+
+
+@app.command(
+    "shell",
+    help="[green]Run girok commands in an interactive prompt[/green] that keeps the session and caches warm",
+    rich_help_panel=":gear: [bold yellow1]Utility Commands[/bold yellow1]",
+)
+def shell():
+    # girok.girok imports this module lazily, so importing it back here is not circular at runtime
+    from girok.girok import invoke, reset_command_state
+
+    # Every mutation made from the shell forgets the coalesced results, so GETs can be shared for much longer
+    # than across the parallel calls of a single command
+    APIClient.coalesce_window = SHELL_COALESCE_WINDOW
+    readline = load_history()
+
+    center_print("girok shell", DisplayBoxType.TITLE)
+    print(
+        "Enter commands without [yellow]girok[/yellow], e.g. [yellow]showtask -t[/yellow]. "
+        "[yellow]help[/yellow] lists the commands, [yellow]exit[/yellow] or Ctrl-D quits.\n"
+    )
+
+    try:
+        while True:
+            try:
+                line = input(PROMPT)
+            except EOFError:
+                print()
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                print(f"[red]{e}[/red]")
+                continue
+
+            if args and args[0] == "girok":
+                args = args[1:]
+            if not args:
+                continue
+            if args[0] in EXIT_COMMANDS:
+                break
+            if args[0] == "help":
+                args = ["--help"]
+            if args[0] == CommandName.SHELL:
+                print("[red]You're already in girok shell.[/red]")
+                continue
+
+            invoke(args)
+            reset_command_state()
+    finally:
+        save_history(readline)
+
+
+def load_history():
+    try:
+        import readline
+    except ImportError:  # Windows
+        return None
+
+    if os.path.exists(SHELL_HISTORY_PATH):
+        try:
+            readline.read_history_file(SHELL_HISTORY_PATH)
+        except OSError:
+            pass
+    readline.set_history_length(SHELL_HISTORY_LENGTH)
+    return readline
+
+
+def save_history(readline) -> None:
+    if readline is None:
+        return
+    try:
+        os.makedirs(APP_DIR, exist_ok=True)
+        readline.write_history_file(SHELL_HISTORY_PATH)
+    except OSError:
+        pass
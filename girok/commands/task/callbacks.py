@@ -110,3 +110,13 @@ def valid_integer_callback(ctx: typer.Context, param: typer.CallbackParam, value
         raise typer.BadParameter("The time window must be a positive integer")
 
     return value
+
+
+def valid_workers_callback(ctx: typer.Context, param: typer.CallbackParam, value: int):
+    if value is None:
+        return None
+
+    if value <= 0:
+        raise typer.BadParameter("The number of parallel requests must be a positive integer")
+
+    return value
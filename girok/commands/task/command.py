@@ -1,6 +1,6 @@
 import calendar
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 import typer
 from rich import print
@@ -8,6 +8,8 @@ from typing_extensions import Annotated
 
 import girok.api.category as category_api
 import girok.api.task as task_api
+from girok.api.entity import StreamError
+from girok.api.response_cache import ResponseCache
 from girok.commands.task.callbacks import (
     allow_empty_category_callback,
     date_callback,
@@ -18,12 +20,14 @@ from girok.commands.task.callbacks import (
     valid_integer_callback,
 )
 from girok.commands.task.display import display_events_by_list, display_events_by_tree
-from girok.commands.task.entity import Category, Event, EventDate, Repetition
+from girok.commands.task.entity import Event
 from girok.commands.task.utils import decode_date_format, validate_start_end_window
 from girok.constants import EVENT_IDS_CACHE_PATH, REPETITION_TYPE, DisplayBoxType
+from girok.utils.completion import complete_category_path, complete_tag, complete_task_id
 from girok.utils.display import center_print
 from girok.utils.json_utils import read_json
 from girok.utils.time import build_date_info, convert_date_obj_to_iso_date_str
+from girok.utils.trace import traced_stage
 
 app = typer.Typer(rich_markup_mode="rich")
 
@@ -57,6 +61,7 @@ def add_task(
             "--category",
             help="[yellow]Category path - xx/yy/zz..[/yellow]",
             callback=allow_empty_category_callback,
+            autocompletion=complete_category_path,
         ),
     ] = None,
     tags: Annotated[
@@ -66,6 +71,7 @@ def add_task(
             "--tag",
             help="[yellow]Tags[/yellow]. Multiple tags must be provided in 'A,B,C' format.",
             callback=tags_callback,
+            autocompletion=complete_tag,
         ),
     ] = None,
     priority: Annotated[
@@ -73,8 +79,32 @@ def add_task(
     ] = None,
     memo: Annotated[Optional[str], typer.Option("-m", "--memo", help="[yellow]Memo[/yellow]")] = None,
 ):
-    """
-    Validate time combination. The possible combinations are:
+    task_fields = build_task_fields(start_datetime, end_datetime, repetition, tags)
+    resp = task_api.create_task(name=name, category_path=category_path, priority=priority, memo=memo, **task_fields)
+    if not resp.is_success:
+        center_print(resp.error_message, DisplayBoxType.ERROR)
+        raise typer.Exit()
+
+    # Display Tasks
+    created_event_id = resp.body["eventId"]
+    resp = task_api.get_all_tasks(stream=True)
+    if not resp.is_success:
+        center_print(resp.error_message, DisplayBoxType.ERROR)
+        raise typer.Exit()
+
+    events = resp.body["events"]
+    event_entities = sort_events(events)
+    display_events_by_list(event_entities, highlight_event_id=created_event_id, highlight_action="highlight")
+
+
+def build_task_fields(
+    start_datetime: tuple, end_datetime: Optional[tuple], repetition: Optional[str], tags: Optional[str]
+) -> dict:
+    """Validate the date, repetition and tag options of a task, already parsed by their callbacks, and convert
+    them into the keyword arguments of `task_api.create_task`. Raises typer.BadParameter on an invalid
+    combination.
+
+    The possible time combinations are:
     1. start_date
     2. start_date, start_time
     3. start_date, end_date
@@ -90,8 +120,7 @@ def add_task(
         raise typer.BadParameter(err_msg)
 
     # Convert tags to list
-    if tags:
-        tags = tags.split(",")
+    tag_list = tags.split(",") if tags else None
 
     # Validate repetition
     repetition_type = None
@@ -128,33 +157,15 @@ def add_task(
 
         repetition_type = REPETITION_TYPE[repetition_type]
 
-    resp = task_api.create_task(
-        name=name,
-        start_date=start_date,
-        start_time=start_time,
-        end_date=end_date,
-        end_time=end_time,
-        repetition_type=repetition_type,
-        repetition_end_date=repetition_end_date,
-        category_path=category_path,
-        tags=tags,
-        priority=priority,
-        memo=memo,
-    )
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
-        raise typer.Exit()
-
-    # Display Tasks
-    created_event_id = resp.body["eventId"]
-    resp = task_api.get_all_tasks()
-    if not resp.is_success:
-        center_print(resp.error_message, DisplayBoxType.ERROR)
-        raise typer.Exit()
-
-    events = resp.body["events"]
-    event_entities = map_to_event_entities(events)
-    display_events_by_list(event_entities, highlight_event_id=created_event_id, highlight_action="highlight")
+    return {
+        "start_date": start_date,
+        "start_time": start_time,
+        "end_date": end_date,
+        "end_time": end_time,
+        "repetition_type": repetition_type,
+        "repetition_end_date": repetition_end_date,
+        "tags": tag_list,
+    }
 
 
 @app.command(
@@ -170,6 +181,7 @@ def showtask(
             "--category",
             help="[yellow]Category path - xx/yy/zz..[/yellow]",
             callback=not_allow_empty_category_callback,
+            autocompletion=complete_category_path,
         ),
     ] = None,
     tags: Annotated[
@@ -179,6 +191,7 @@ def showtask(
             "--tag",
             help="[yellow]Tags[/yellow]. Multiple tags must be provided in 'A,B,C' format.",
             callback=tags_callback,
+            autocompletion=complete_tag,
         ),
     ] = None,
     priority: Annotated[
@@ -271,7 +284,10 @@ def showtask(
             '--tree',
             help="[yellow]Show tasks in a tree view[/yellow]"
         )
-    ] = None
+    ] = None,
+    fresh: Annotated[
+        bool, typer.Option("--fresh", help="[yellow]Bypass the local cache[/yellow] and fetch tasks from the server")
+    ] = False,
 ):
     # Resolve start_date and end_date
     """
@@ -308,6 +324,9 @@ def showtask(
     if date_options_cnt > 1:
         raise typer.BadParameter("You can specify only one date option.")
 
+    if fresh:
+        ResponseCache.configure(bypass=True)
+
     start_date, end_date = "2000-01-01", convert_date_obj_to_iso_date_str(datetime.now() + timedelta(days=365))
     if exact_date:
         start_date, end_date = exact_date, exact_date
@@ -364,7 +383,13 @@ def showtask(
         tags = tags.split("/")
 
     resp = task_api.get_all_tasks(
-        start_date=start_date, end_date=end_date, category_id=category_id, priority=priority, tags=tags, fetch_children=True
+        start_date=start_date,
+        end_date=end_date,
+        category_id=category_id,
+        priority=priority,
+        tags=tags,
+        fetch_children=True,
+        stream=True,
     )
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
@@ -373,7 +398,7 @@ def showtask(
     events = resp.body["events"]
 
     # Display Events
-    event_entities = map_to_event_entities(events)
+    event_entities = sort_events(events)
     center_print(build_date_info(datetime.now()), DisplayBoxType.TITLE)
     if tree_view:
         resp = category_api.get_all_categories()
@@ -392,7 +417,9 @@ def showtask(
     rich_help_panel=":fire: [bold yellow1]Task Commands[/bold yellow1]",
 )
 def remove_event(
-    event_id: Annotated[int, typer.Argument(help="[yellow]Task ID[/yellow] to be deleted")],
+    event_id: Annotated[
+        int, typer.Argument(help="[yellow]Task ID[/yellow] to be deleted", autocompletion=complete_task_id)
+    ],
     force: Annotated[Optional[bool], typer.Option("-y", "--yes", help="Don't show the confirmation message")] = False,
 ):
     try:
@@ -415,13 +442,13 @@ def remove_event(
             raise typer.Exit()
 
     # Display events
-    resp = task_api.get_all_tasks()
+    resp = task_api.get_all_tasks(stream=True)
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
 
     events = resp.body["events"]
-    event_entities = map_to_event_entities(events)
+    event_entities = sort_events(events)
 
     # Remove events
     resp = task_api.remove_event(target_event_id)
@@ -433,30 +460,17 @@ def remove_event(
     display_events_by_list(event_entities, highlight_event_id=target_event_id, highlight_action="delete")
 
 
-def map_to_event_entities(events: List[dict]) -> List[Event]:
-    event_entities: List[Event] = []
-    for event in events:
-        event_entity = Event(
-            id=event["id"],
-            name=event["name"],
-            color_str=event["color"],
-            tags=event["tags"],
-            priority=event["priority"],
-            memo=event["memo"],
-            event_date=EventDate(
-                start_date=event["eventDate"]["startDate"],
-                start_time=event["eventDate"]["startTime"],
-                end_date=event["eventDate"]["endDate"],
-                end_time=event["eventDate"]["endTime"],
-            ),
-            repetition=Repetition(
-                repetition_type=event["repetition"]["repetitionType"],
-                repetition_end_date=event["repetition"]["repetitionEndDate"],
-            ),
-            category_path=[Category(id=c["categoryId"], name=c["categoryName"]) for c in event["categoryPath"]],
-        )
-
-        event_entities.append(event_entity)
+@traced_stage("decode + sort events")
+def sort_events(events: Iterable[Event]) -> List[Event]:
+    try:
+        event_entities = list(events)
+    except StreamError as e:
+        center_print(str(e), DisplayBoxType.ERROR)
+        raise typer.Exit()
+    except ValueError as e:
+        # A streamed body can only turn out to be malformed while it's being consumed
+        center_print(f"Unexpected response from the server ({e})", DisplayBoxType.ERROR)
+        raise typer.Exit()
 
     def sort_key(event: Event):
         # Handle None values for start_time and end_time by replacing them with "00:00"
@@ -480,7 +494,8 @@ def update_task(
     event_id: Annotated[
         int,
         typer.Argument(
-            help="[yellow]Task ID[/yellow]"
+            help="[yellow]Task ID[/yellow]",
+            autocompletion=complete_task_id,
         )
     ],
     name: Annotated[
@@ -513,6 +528,7 @@ def update_task(
             "--category",
             help="[yellow]Category path - xx/yy/zz..[/yellow]",
             callback=allow_empty_category_callback,
+            autocompletion=complete_category_path,
         ),
     ] = None,
     tags: Annotated[
@@ -522,6 +538,7 @@ def update_task(
             "--tag",
             help="[yellow]Tags[/yellow]. Multiple tags must be provided in 'A,B,C' format.",
             callback=tags_callback,
+            autocompletion=complete_tag,
         ),
     ] = None,
     priority: Annotated[
@@ -607,35 +624,35 @@ def update_task(
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
-    event = resp.body
+    event: Event = resp.body
 
     if category_path is None:
-        category_path = '/'.join([c['categoryName'] for c in event['categoryPath']])    
+        category_path = '/'.join([c.name for c in event.category_path])
 
     resp = task_api.update_task(
         event_id=target_event_id,
-        name=name if name else event['name'],
-        start_date=start_date if start_date else event['eventDate']['startDate'],
-        start_time=start_time if start_time else event['eventDate']['startTime'],
-        end_date=end_date if end_date else event['eventDate']['endDate'],
-        end_time=end_time if end_time else event['eventDate']['endTime'],
-        repetition_type=repetition_type if repetition_type else event['repetition']['repetitionType'],
-        repetition_end_date=repetition_end_date if repetition_end_date else event['repetition']['repetitionEndDate'],
+        name=name if name else event.name,
+        start_date=start_date if start_date else event.event_date.start_date,
+        start_time=start_time if start_time else event.event_date.start_time,
+        end_date=end_date if end_date else event.event_date.end_date,
+        end_time=end_time if end_time else event.event_date.end_time,
+        repetition_type=repetition_type if repetition_type else event.repetition.repetition_type,
+        repetition_end_date=repetition_end_date if repetition_end_date else event.repetition.repetition_end_date,
         category_path=category_path,
-        tags=tags if tags else event['tags'],
-        priority=priority if priority else event['priority'],
-        memo=memo if memo else event['memo'],
+        tags=tags if tags else event.tags,
+        priority=priority if priority else event.priority,
+        memo=memo if memo else event.memo,
     )
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
 
     # Display Tasks
-    resp = task_api.get_all_tasks()
+    resp = task_api.get_all_tasks(stream=True)
     if not resp.is_success:
         center_print(resp.error_message, DisplayBoxType.ERROR)
         raise typer.Exit()
 
     events = resp.body["events"]
-    event_entities = map_to_event_entities(events)
+    event_entities = sort_events(events)
     display_events_by_list(event_entities, highlight_event_id=target_event_id, highlight_action="highlight")
@@ -10,6 +10,7 @@ from rich.style import Style
 from rich.table import Column, Table
 from rich.text import Text
 
+from girok.api.entity import CategoryNode
 from girok.commands.task.entity import Category, Event, EventDate, Repetition
 from girok.commands.task.utils import cache_event_ids
 from girok.constants import (
@@ -27,8 +28,10 @@ from girok.constants import (
     EVENT_TREE_DATETIME_COLOR
 )
 from girok.utils.time import convert_iso_date_str_to_date_obj, get_day_offset
+from girok.utils.trace import traced_stage
 
 
+@traced_stage("render task list")
 def display_events_by_list(
     events: List[Event],
     highlight_event_id: Optional[int] = None,
@@ -196,8 +199,9 @@ def display_events_by_list(
     return table
 
 
+@traced_stage("render task tree")
 def display_events_by_tree(
-    categories: List[dict],
+    categories: List[CategoryNode],
     events: List[Event],
     highlight_event_id: Optional[int] = None,
     highlight_action: Literal["highlight", "delete"] = None,
@@ -238,15 +242,15 @@ def display_events_by_tree(
     print(tree_obj)
 
 
-def build_category_tree(category_tree: dict, category: dict):
-    category_tree[category['name']] = {
+def build_category_tree(category_tree: dict, category: CategoryNode):
+    category_tree[category.name] = {
         "subcategories": {},
         "events": [],
-        "color": CATEGORY_COLOR_PALETTE[category['color']]
+        "color": CATEGORY_COLOR_PALETTE[category.color]
     }
 
-    for child in category['children']:
-        build_category_tree(category_tree[category['name']]['subcategories'], child)
+    for child in category.children:
+        build_category_tree(category_tree[category.name]['subcategories'], child)
 
 
 
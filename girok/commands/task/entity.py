@@ -1,5 +1,5 @@
 import calendar
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 from typing import List, Optional
 
@@ -9,6 +9,8 @@ from girok.utils.time import convert_iso_date_str_to_date_obj
 
 @dataclass
 class EventDate:
+    __slots__ = ("start_date", "start_time", "end_date", "end_time")
+
     start_date: str
     start_time: Optional[str]
     end_date: Optional[str]
@@ -17,18 +19,35 @@ class EventDate:
 
 @dataclass
 class Repetition:
+    __slots__ = ("repetition_type", "repetition_end_date")
+
     repetition_type: str
     repetition_end_date: str
 
 
 @dataclass
 class Category:
+    __slots__ = ("id", "name")
+
     id: int
     name: str
 
 
 @dataclass
 class Event:
+    __slots__ = (
+        "id",
+        "name",
+        "color_str",
+        "tags",
+        "priority",
+        "memo",
+        "event_date",
+        "repetition",
+        "category_path",
+        "color_hex",
+    )
+
     id: int
     name: str
     color_str: str
@@ -91,4 +110,41 @@ class Event:
                 end = min(end_date, month_last_date)
                 return [d for d in range(start.day, end.day + 1)]
             else: # single-day
-                return [start_date.day]
\ No newline at end of file
+                return [start_date.day]
+
+    def get_due_date(self, today: date) -> Optional[date]:
+        """The date the task is due by: its end date (or start date) for a one-off task, and the next occurrence
+        on or after `today` for a repeating task. None if a repeating task has no occurrence left."""
+        start_date = date.fromisoformat(self.event_date.start_date)
+        repetition_type = self.repetition.repetition_type
+        if not repetition_type:
+            return date.fromisoformat(self.event_date.end_date) if self.event_date.end_date else start_date
+
+        if start_date >= today:
+            return start_date
+
+        if repetition_type == "DAILY":
+            due_date = today
+        elif repetition_type == "WEEKLY":
+            due_date = today + timedelta(days=(start_date.weekday() - today.weekday()) % 7)
+        elif repetition_type == "MONTHLY":
+            due_date = get_clamped_date(today.year, today.month, start_date.day)
+            if due_date < today:
+                year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+                due_date = get_clamped_date(year, month, start_date.day)
+        elif repetition_type == "YEARLY":
+            due_date = get_clamped_date(today.year, start_date.month, start_date.day)
+            if due_date < today:
+                due_date = get_clamped_date(today.year + 1, start_date.month, start_date.day)
+        else:
+            raise ValueError("Invalid repetition type")
+
+        repetition_end_date = self.repetition.repetition_end_date
+        if repetition_end_date and due_date > date.fromisoformat(repetition_end_date):
+            return None
+        return due_date
+
+
+def get_clamped_date(year: int, month: int, day: int) -> date:
+    """The date, moved back to the last day of the month when the month is shorter (e.g. 31 -> Feb 28)."""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
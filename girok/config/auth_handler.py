@@ -1,8 +1,12 @@
+import base64
+import json
 import os
+import time
+from typing import Optional
 
-import girok.api.auth as auth_api
-from girok.constants import APP_DIR, CONFIG_PATH
-from girok.utils.json_utils import read_json, update_json, write_json
+from girok.api.response_cache import ResponseCache
+from girok.config.config_store import ConfigStore
+from girok.constants import APP_DIR, AUTH_TOKEN_EXPIRY_MARGIN, AUTH_TOKEN_VERIFY_TTL
 
 
 class AuthHandler:
@@ -14,42 +18,84 @@ class AuthHandler:
             os.makedirs(APP_DIR)
 
         # Ensure config.json exists
-        if not os.path.exists(CONFIG_PATH):
-            write_json(CONFIG_PATH, {})
+        if not ConfigStore.exists():
+            ConfigStore.save({})
 
     @classmethod
     def is_logged_in(cls) -> bool:
         # Ensure config.json exists
-        if not is_config_exist():
+        if not ConfigStore.exists():
             return False
 
         # Ensure access_token is present
-        cfg = read_json(CONFIG_PATH)
+        cfg = ConfigStore.load()
         if "access_token" not in cfg:
             return False
 
-        # Ensure access_token is valid
+        # Ensure access_token is valid. Its expiry is checked locally, and the server is only asked
+        # when the token can't be decoded or is about to expire.
         access_token = cfg["access_token"]
-        return auth_api.verify_access_token(access_token)
+        expires_at = get_token_expiry(access_token)
+        if expires_at is not None:
+            remaining_seconds = expires_at - time.time()
+            if remaining_seconds <= 0:
+                return False
+            if remaining_seconds > AUTH_TOKEN_EXPIRY_MARGIN:
+                return True
+
+        # A positive answer from the server is trusted for a while. A 401 from any later request drops it.
+        verified_at = cfg.get("access_token_verified_at")
+        verify_ttl = cfg.get("token_verify_ttl", AUTH_TOKEN_VERIFY_TTL)
+        if verified_at is not None and 0 <= time.time() - verified_at < verify_ttl:
+            return True
+
+        # The HTTP client is only loaded when the server has to be asked
+        import girok.api.auth as auth_api
+
+        is_valid = auth_api.verify_access_token(access_token)
+        if is_valid:
+            ConfigStore.update({"access_token_verified_at": time.time()})
+        return is_valid
 
     @classmethod
     def login(cls, access_token: str) -> None:
-        update_json(CONFIG_PATH, {"access_token": access_token})
+        # The server has just issued the token, so it counts as verified
+        ConfigStore.update({"access_token": access_token, "access_token_verified_at": time.time()})
+        # Cached responses belong to the previous account
+        ResponseCache.clear()
 
     @classmethod
     def logout(cls) -> None:
-        cfg = read_json(CONFIG_PATH)
-        if "access_token" in cfg:
-            del cfg["access_token"]
-            write_json(CONFIG_PATH, cfg)
+        cls.invalidate_access_token()
+        ResponseCache.clear()
+
+    @classmethod
+    def invalidate_access_token(cls) -> None:
+        """Forget the access token after the server rejected it (401), so the next command asks to log in."""
+        ConfigStore.remove("access_token", "access_token_verified_at")
 
     @classmethod
     def get_access_token(cls) -> str:
-        cfg = read_json(CONFIG_PATH)
-        if "access_token" not in cfg:
+        access_token = ConfigStore.get("access_token")
+        if access_token is None:
             raise ValueError("Access token not found.")
-        return cfg["access_token"]
+        return access_token
+
+
+def get_token_expiry(access_token: str) -> Optional[float]:
+    """Read the 'exp' claim of a JWT without verifying its signature. The server still verifies it.
 
+    Returns:
+        Optional[float]: Expiry as a unix timestamp, or None if the token is not a JWT with an 'exp' claim.
+    """
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        expires_at = claims["exp"]
+    except (IndexError, ValueError, TypeError, KeyError):
+        return None
 
-def is_config_exist():
-    return os.path.exists(CONFIG_PATH)
+    if isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+        return None
+    return float(expires_at)
@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from girok.constants import CONFIG_PATH
+from girok.utils.json_utils import modify_json, read_json
+
+
+class ConfigStore:
+    """Process-wide, in-memory copy of config.json.
+
+    The file is parsed once and parsed again only when its mtime (or size) changes, e.g. because another girok
+    process logged in. Every write goes through `modify` (or `update` / `remove` on top of it): a read-modify-write
+    cycle under config.json's file lock, which also keeps the in-memory copy in sync.
+    """
+
+    _data: Optional[dict] = None
+    _stamp: Optional[Tuple[int, int]] = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def exists(cls) -> bool:
+        return os.path.exists(CONFIG_PATH)
+
+    @classmethod
+    def load(cls) -> dict:
+        """Return the current config. The returned dict is shared and must not be mutated."""
+        with cls._lock:
+            stamp = get_file_stamp(CONFIG_PATH)
+            if cls._data is None or stamp != cls._stamp:
+                cls._data = read_json(CONFIG_PATH) if stamp is not None else {}
+                cls._stamp = stamp
+            return cls._data
+
+    @classmethod
+    def get(cls, key: str, default: Any = None) -> Any:
+        return cls.load().get(key, default)
+
+    @classmethod
+    def update(cls, data: dict) -> None:
+        cls.modify(lambda cfg: {**cfg, **data})
+
+    @classmethod
+    def remove(cls, *keys: str) -> None:
+        cls.modify(lambda cfg: {k: v for k, v in cfg.items() if k not in keys})
+
+    @classmethod
+    def save(cls, data: dict) -> None:
+        cls.modify(lambda _: data)
+
+    @classmethod
+    def modify(cls, modify: Callable[[dict], dict]) -> dict:
+        """Read-modify-write config.json under its file lock, starting from the content on disk rather than
+        the in-memory copy, so that concurrent girok processes don't lose each other's changes."""
+        with cls._lock:
+            data = modify_json(CONFIG_PATH, modify)
+            cls._data = data
+            cls._stamp = get_file_stamp(CONFIG_PATH)
+            return data
+
+
+def get_file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
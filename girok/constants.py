@@ -10,14 +10,62 @@ APP_NAME = "girok"
 APP_DIR = typer.get_app_dir(APP_NAME)
 CONFIG_PATH = os.path.join(APP_DIR, "config.json")
 EVENT_IDS_CACHE_PATH = os.path.join(APP_DIR, "event_ids_cache.json")
+RESPONSE_CACHE_DIR = os.path.join(APP_DIR, "response_cache")
+RESPONSE_CACHE_TTL = 60  # seconds
+RESPONSE_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+CATEGORY_INDEX_MAX_AGE = 10 * 60  # seconds
 VERSION = "0.2.5"
 
+# Shell completion
+COMPLETION_TIME_BUDGET = 0.05  # seconds
+COMPLETION_MAX_BODY_SIZE = 1024 * 1024  # bytes
+COMPLETION_REFRESH_STAMP_PATH = os.path.join(APP_DIR, "completion_refresh.stamp")
+COMPLETION_REFRESH_COOLDOWN = RESPONSE_CACHE_TTL  # seconds
+
+# Auth
+AUTH_TOKEN_EXPIRY_MARGIN = 5 * 60  # seconds
+AUTH_TOKEN_VERIFY_TTL = 5 * 60  # seconds, overridden by 'token_verify_ttl' in config.json
+
+# API Client
+API_POOL_MAXSIZE = 10
+API_CONNECT_TIMEOUT = 3.05  # seconds
+API_READ_TIMEOUT = 15  # seconds
+API_MAX_RETRIES = 3
+API_BACKOFF_BASE = 0.5  # seconds
+API_BACKOFF_MAX = 8  # seconds
+API_RETRY_AFTER_MAX = 30  # seconds
+API_RETRY_STATUS_CODES = (429, 502, 503, 504)
+API_COALESCE_WINDOW = 2  # seconds
+API_STREAM_CHUNK_SIZE = 64 * 1024  # bytes
+API_BULK_MAX_WORKERS = API_POOL_MAXSIZE
+API_BULK_RATE = 20  # requests per second
+API_BULK_BURST = 10  # requests
+API_BULK_MIN_RATE = 1  # requests per second
+API_BULK_RATE_STEP = 1  # requests per second, regained per successful response
+API_THROTTLE_STATUS_CODES = (429, 503)
+
+# Daemon
+DAEMON_LOG_PATH = os.path.join(APP_DIR, "daemon.log")
+DAEMON_IDLE_TIMEOUT = 30 * 60  # seconds
+DAEMON_START_TIMEOUT = 10  # seconds
+DAEMON_REQUEST_TIMEOUT = 5  # seconds, for a connected client to send its request
+DAEMON_REFRESH_INTERVAL = RESPONSE_CACHE_TTL / 2  # seconds
+DAEMON_REFRESH_RECENT_WINDOW = 10 * 60  # seconds, since a command last used a cache entry
+DAEMON_REFRESH_MAX_ENTRIES = 8
+
+# Shell
+SHELL_HISTORY_PATH = os.path.join(APP_DIR, "shell_history")
+SHELL_HISTORY_LENGTH = 1000  # lines
+SHELL_COALESCE_WINDOW = RESPONSE_CACHE_TTL  # seconds
+
 
 # Commands
 class CommandName:
 
     # Utility Commands
     VERSION = "version"
+    DAEMON = "daemon"
+    SHELL = "shell"
 
     # Auth Commands
     REGISTER = "register"
@@ -29,6 +77,7 @@ class CommandName:
 
     # Task Commands
     ADD_TASK = "addtask"
+    BATCH = "batch"
 
 
 # Terminal display color
@@ -105,6 +154,8 @@ REPETITION_TYPE = {"daily": "DAILY", "weekly": "WEEKLY", "monthly": "MONTHLY", "
 
 DEFAULT_CATEGORY_TEXT_COLOR = "#D7C8B7"
 HIGHLIGHT_CATEGORY_TEXT_COLOR = "#B9D66A"
+TASK_OVERDUE_TEXT_COLOR = "#FF6B6B"
+TASK_DUE_THIS_WEEK_TEXT_COLOR = "#F9D27B"
 
 TABLE_HEADER_TEXT_COLOR = "#D7E1C9"
 TABLE_EVENT_NAME_COLOR = "#FAC7C1"
@@ -0,0 +1,96 @@
+"""Entry point of the `girok` executable.
+
+When a daemon is running (`girok daemon start`) and the command is one it serves, the command is forwarded to
+the daemon, which already has everything imported, the config loaded and connections to the server open.
+Otherwise, or if the daemon can't be reached, the command runs in this process as usual.
+"""
+
+import os
+import socket
+import sys
+from typing import List, Optional
+
+from girok.daemon.protocol import (
+    DAEMON_COMMANDS,
+    get_socket_path,
+    is_owned_socket,
+    is_same_user,
+    is_supported,
+    recv_message,
+    send_message,
+)
+
+
+def main() -> None:
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from girok.girok import app
+
+    app()
+
+
+def forward(args: List[str]) -> Optional[int]:
+    """Run the command in the daemon.
+
+    Returns:
+        Optional[int]: Exit code of the command, or None if it has to run locally.
+    """
+    if not args or args[0] not in DAEMON_COMMANDS or not is_supported():
+        return None
+
+    # The daemon renders for a terminal. Piped or redirected output is produced locally, without colors.
+    if not sys.stdout.isatty():
+        return None
+
+    # The terminal is only handed to a daemon of the same user
+    socket_path = get_socket_path()
+    if not is_owned_socket(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+            if not is_same_user(sock):
+                return None
+            send_message(sock, {"command": "run", "args": args, "cwd": os.getcwd()}, fds=[0, 1, 2])
+        except OSError:
+            # Stale socket of a daemon that is gone. Nothing has run yet, so running locally is safe.
+            return None
+
+        try:
+            reply, _ = recv_message(sock)
+        except (OSError, ValueError):
+            # The command may have been half done, so it must not run a second time
+            print("girok daemon stopped while running the command.", file=sys.stderr)
+            return 1
+    finally:
+        sock.close()
+
+    return reply["exit_code"]
+
+
+def request_daemon(command: str) -> Optional[dict]:
+    """Send a control request ('status' or 'stop'). Returns None if no daemon is running."""
+    socket_path = get_socket_path()
+    if not is_owned_socket(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        if not is_same_user(sock):
+            return None
+        send_message(sock, {"command": command})
+        reply, _ = recv_message(sock)
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    return reply
+
+
+if __name__ == "__main__":
+    main()
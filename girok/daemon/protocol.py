@@ -0,0 +1,94 @@
+"""Messages exchanged between the girok client and the daemon over a Unix domain socket.
+
+A message is a 4-byte big-endian length followed by that many bytes of JSON. The client's request also carries
+its stdin, stdout and stderr file descriptors (SCM_RIGHTS), so the daemon writes to the client's terminal
+directly.
+
+The client imports this module before anything else, so it must stay on the standard library: girok.constants
+pulls in typer, which is most of the startup time the daemon exists to save.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import tempfile
+from typing import List, Sequence, Tuple
+
+# Commands the daemon runs for the client. Commands that prompt (login, register, done, rmcat) or take over the
+# terminal (cal) always run in the client's own process.
+DAEMON_COMMANDS = frozenset(
+    ["version", "showtask", "showcat", "colors", "addtask", "uptask", "addcat", "upcat", "mvcat"]
+)
+HEADER = struct.Struct("!I")
+PEER_CREDENTIALS = struct.Struct("3i")  # struct ucred: pid, uid, gid
+MAX_MESSAGE_SIZE = 1024 * 1024  # bytes
+
+
+def get_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"girok-{os.getuid()}.sock")
+
+
+def is_owned_socket(socket_path: str) -> bool:
+    """Whether the socket file exists and belongs to the current user. The default path is predictable, so
+    another user could create it first to receive the client's terminal."""
+    try:
+        st = os.stat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def is_same_user(sock: socket.socket) -> bool:
+    """Whether the process at the other end of a connected socket runs as the current user. Where the platform
+    can't tell (no SO_PEERCRED), the owner check of the socket file is all there is."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    try:
+        credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, PEER_CREDENTIALS.size)
+    except OSError:
+        return False
+    _, uid, _ = PEER_CREDENTIALS.unpack(credentials)
+    return uid == os.getuid()
+
+
+def is_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+
+def send_message(sock: socket.socket, message: dict, fds: Sequence[int] = ()) -> None:
+    data = json.dumps(message).encode()
+    header = HEADER.pack(len(data))
+    if fds:
+        socket.send_fds(sock, [header], list(fds))
+    else:
+        sock.sendall(header)
+    sock.sendall(data)
+
+
+def recv_message(sock: socket.socket, max_fds: int = 0) -> Tuple[dict, List[int]]:
+    if max_fds:
+        header, fds, _, _ = socket.recv_fds(sock, HEADER.size, max_fds)
+    else:
+        header, fds = sock.recv(HEADER.size), []
+    header += recv_exactly(sock, HEADER.size - len(header))
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError(f"Message of {length} bytes exceeds the limit of {MAX_MESSAGE_SIZE} bytes")
+    return json.loads(recv_exactly(sock, length)), fds
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed in the middle of a message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
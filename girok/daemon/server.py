@@ -0,0 +1,227 @@
+"""The girok daemon: a long-lived process that runs girok commands on behalf of the client.
+
+It keeps the command modules imported, config.json and the token state in memory (ConfigStore), and the pooled
+API session with its keep-alive connections open. In a background thread, it revalidates the response cache
+entries its commands used recently before they go stale, so that the category tree and event lists are served
+without a round trip.
+
+Commands run one at a time. For each one, the client's stdin, stdout and stderr are swapped in as file
+descriptors 0, 1 and 2, so rich detects the client's terminal size and output goes straight to it.
+
+Started by `girok daemon start`, which runs `python -m girok.daemon.server`. It exits after DAEMON_IDLE_TIMEOUT
+seconds without a command, or on `girok daemon stop`.
+"""
+
+import importlib
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from girok.config.auth_handler import AuthHandler
+from girok.config.config_store import ConfigStore
+from girok.constants import (
+    DAEMON_IDLE_TIMEOUT,
+    DAEMON_REFRESH_INTERVAL,
+    DAEMON_REFRESH_MAX_ENTRIES,
+    DAEMON_REFRESH_RECENT_WINDOW,
+    DAEMON_REQUEST_TIMEOUT,
+)
+from girok.daemon.protocol import DAEMON_COMMANDS, get_socket_path, is_same_user, recv_message, send_message
+from girok.girok import LAZY_COMMANDS, invoke, reset_command_state
+
+STD_FDS = (0, 1, 2)
+
+
+class DaemonStopped(BaseException):
+    """Raised by the SIGTERM handler. A BaseException so that a running command doesn't swallow it."""
+
+
+class DaemonServer:
+    def __init__(
+        self,
+        socket_path: str,
+        idle_timeout: float = DAEMON_IDLE_TIMEOUT,
+        refresh_interval: float = DAEMON_REFRESH_INTERVAL,
+    ):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.refresh_interval = refresh_interval
+        self.started_at = time.time()
+        self.commands_served = 0
+        self.is_running = False
+        self.refresh_thread: Optional[threading.Thread] = None
+
+    def serve_forever(self) -> None:
+        listener = bind_socket(self.socket_path)
+        self.is_running = True
+        last_active_at = last_refreshed_at = time.monotonic()
+        try:
+            while self.is_running:
+                now = time.monotonic()
+                if now - last_active_at >= self.idle_timeout:
+                    break
+                if now - last_refreshed_at >= self.refresh_interval:
+                    self.start_refresh()
+                    last_refreshed_at = now
+
+                listener.settimeout(
+                    max(0.0, min(last_active_at + self.idle_timeout, last_refreshed_at + self.refresh_interval) - now)
+                )
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+
+                with conn:
+                    if is_same_user(conn):
+                        self.handle(conn)
+                last_active_at = time.monotonic()
+        finally:
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def start_refresh(self) -> None:
+        """Refresh the response cache in the background, so that clients never wait behind it."""
+        if self.refresh_thread is not None and self.refresh_thread.is_alive():
+            return
+        self.refresh_thread = threading.Thread(target=refresh_response_cache, name="girok-refresh", daemon=True)
+        self.refresh_thread.start()
+
+    def handle(self, conn: socket.socket) -> None:
+        conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+        try:
+            message, fds = recv_message(conn, max_fds=len(STD_FDS))
+        except (OSError, ValueError):
+            return
+        conn.settimeout(None)
+
+        command = message.get("command")
+        if command == "run" and len(fds) == len(STD_FDS):
+            reply = {"exit_code": self.run_command(message["args"], message["cwd"], fds)}
+            self.commands_served += 1
+        elif command == "status":
+            reply = {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "commands_served": self.commands_served,
+            }
+        elif command == "stop":
+            self.is_running = False
+            reply = {"pid": os.getpid()}
+        else:
+            reply = {"error": f"Unknown request '{command}'"}
+
+        for fd in fds:
+            os.close(fd)
+        try:
+            send_message(conn, reply)
+        except OSError:
+            pass
+
+    def run_command(self, args: List[str], cwd: str, fds: List[int]) -> int:
+        saved_fds = [os.dup(fd) for fd in STD_FDS]
+        saved_cwd = os.getcwd()
+        try:
+            for fd, client_fd in zip(STD_FDS, fds):
+                os.dup2(client_fd, fd)
+            os.chdir(cwd)
+            reset_command_state()
+            return invoke(args)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in zip(STD_FDS, saved_fds):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+            os.chdir(saved_cwd)
+
+
+def warm_up() -> None:
+    from girok.api.response_cache import ResponseCache
+    from girok.api_client import APIClient
+
+    for command_name in DAEMON_COMMANDS:
+        if command_name in LAZY_COMMANDS:
+            importlib.import_module(LAZY_COMMANDS[command_name])
+
+    AuthHandler.init()
+    ResponseCache.record_access = True
+    APIClient.get_session()
+    try:
+        AuthHandler.is_logged_in()
+    except Exception:
+        traceback.print_exc()
+
+
+def refresh_response_cache() -> None:
+    """Revalidate the stale cached GET responses that commands used in the last DAEMON_REFRESH_RECENT_WINDOW
+    seconds (at most DAEMON_REFRESH_MAX_ENTRIES of them), so that the next command doesn't wait for it."""
+    from girok.api.response_cache import ResponseCache
+    from girok.api_client import APIClient
+
+    # Not logged in
+    if ConfigStore.get("access_token") is None:
+        return
+
+    now = time.time()
+    recent = sorted(
+        (access for access in list(ResponseCache.accessed.values()) if now - access[0] < DAEMON_REFRESH_RECENT_WINDOW),
+        key=lambda access: access[0],
+    )
+    for _, endpoint, params in recent[-DAEMON_REFRESH_MAX_ENTRIES:]:
+        try:
+            entry = ResponseCache.get(endpoint, params)
+            if entry is not None and not ResponseCache.is_fresh(entry):
+                resp = APIClient.get(endpoint, params=params, cache=True)
+                if not resp.is_success:
+                    break
+        except Exception:
+            # A refresh is only an optimization: the command that needs the entry fetches it anyway
+            continue
+
+
+def bind_socket(socket_path: str) -> socket.socket:
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)  # left behind by a daemon that didn't shut down cleanly
+        else:
+            raise RuntimeError(f"Another girok daemon is listening on {socket_path}")
+        finally:
+            probe.close()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only the owner may connect: whoever can, runs commands with the owner's access token
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    listener.listen()
+    return listener
+
+
+def main() -> None:
+    signal.signal(signal.SIGTERM, stop_on_signal)
+    warm_up()
+    try:
+        DaemonServer(get_socket_path()).serve_forever()
+    except DaemonStopped:
+        pass
+
+
+def stop_on_signal(signum: int, frame) -> None:
+    # Unwinds through the `finally` of serve_forever, which removes the socket
+    raise DaemonStopped()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,67 @@
+import importlib
 import os
+import traceback
+from typing import List, Optional
 
+import click
 import typer
+import typer.main
 from rich import print
+from typer import rich_utils
+from typer.core import TyperGroup
+from typing_extensions import Annotated
 
-import girok.commands.auth.command as auth_command
-import girok.commands.category.command as category_command
-import girok.commands.task.command as task_command
-import girok.commands.calendar.command as calendar_command
 from girok.config.auth_handler import AuthHandler
 from girok.constants import VERSION, CommandName
+from girok.utils.trace import Tracer, finish_trace
+
+# Command name -> module defining it. A command module, and whatever it pulls in (requests, rich tables, textual
+# for 'cal'), is only imported when one of its commands runs.
+LAZY_COMMANDS = {
+    "register": "girok.commands.auth.command",
+    "login": "girok.commands.auth.command",
+    "logout": "girok.commands.auth.command",
+    "showcat": "girok.commands.category.command",
+    "addcat": "girok.commands.category.command",
+    "rmcat": "girok.commands.category.command",
+    "upcat": "girok.commands.category.command",
+    "mvcat": "girok.commands.category.command",
+    "colors": "girok.commands.category.command",
+    "addtask": "girok.commands.task.command",
+    "showtask": "girok.commands.task.command",
+    "done": "girok.commands.task.command",
+    "uptask": "girok.commands.task.command",
+    "batch": "girok.commands.batch.command",
+    "cal": "girok.commands.calendar.command",
+    "daemon": "girok.commands.daemon.command",
+    "shell": "girok.commands.shell.command",
+}
+
+
+class LazyCommandGroup(TyperGroup):
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(self.commands) | set(LAZY_COMMANDS))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in LAZY_COMMANDS:
+            command_module = importlib.import_module(LAZY_COMMANDS[cmd_name])
+            for command_info in command_module.app.registered_commands:
+                if command_info.name == cmd_name:
+                    command = typer.main.get_command_from_info(
+                        command_info,
+                        pretty_exceptions_short=app.pretty_exceptions_short,
+                        rich_markup_mode=app.rich_markup_mode,
+                    )
+                    self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
 
 app = typer.Typer(
+    cls=LazyCommandGroup,
     rich_markup_mode="rich",
     help="Enter [red]girok <command name> --help[/red] to see more detailed documentations of commands!",
 )
 
-app.registered_commands.extend(auth_command.app.registered_commands)
-app.registered_commands.extend(category_command.app.registered_commands)
-app.registered_commands.extend(task_command.app.registered_commands)
-app.registered_commands.extend(calendar_command.app.registered_commands)
-
 
 @app.command("version")
 def version():
@@ -27,22 +69,35 @@ def version():
 
 
 @app.callback()
-def pre_command_callback(ctx: typer.Context):
+def pre_command_callback(
+    ctx: typer.Context,
+    trace: Annotated[
+        bool, typer.Option("--trace", help="Print a [yellow]timing breakdown[/yellow] of API calls and local stages")
+    ] = False,
+    trace_file: Annotated[
+        Optional[str], typer.Option("--trace-file", help="[yellow]Write the trace spans[/yellow] to a JSON file")
+    ] = None,
+):
     # Get the executed command name
     cmd = ctx.invoked_subcommand
 
+    if trace or trace_file:
+        Tracer.enable()
+        ctx.call_on_close(lambda: finish_trace(trace, trace_file))
+
     # Set up application directory and config.json
     AuthHandler.init()
 
     # Utility commands
-    if cmd in [CommandName.VERSION, CommandName.COLORS]:
+    if cmd in [CommandName.VERSION, CommandName.COLORS, CommandName.DAEMON]:
         return
 
     """
     Login, Register -> login 되면 X
     나머지 -> login 필수
     """
-    is_logged_in = AuthHandler.is_logged_in()
+    with Tracer.stage("check login"):
+        is_logged_in = AuthHandler.is_logged_in()
 
     # Logout required commands
     if cmd in [CommandName.REGISTER, CommandName.LOGIN]:
@@ -56,5 +111,32 @@ def pre_command_callback(ctx: typer.Context):
             raise typer.Exit()
 
 
+def invoke(args: List[str]) -> int:
+    """Run one command line in this process and return its exit code, for callers that run many commands
+    (the daemon, `girok shell`). Errors are printed the way typer prints them, but never exit the process."""
+    try:
+        result = app(args=args, prog_name="girok", standalone_mode=False)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    except click.ClickException as e:
+        rich_utils.rich_format_error(e)
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+def reset_command_state() -> None:
+    """Undo per-command options, which are class attributes and would otherwise stick to later commands."""
+    from girok.api.response_cache import ResponseCache
+
+    ResponseCache.configure(bypass=False)
+    Tracer.enabled = False
+
+
 if __name__ == "__main__":
     app()
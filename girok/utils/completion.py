@@ -0,0 +1,130 @@
+"""Shell completion of category paths, tags and task IDs.
+
+Completers run on every TAB press, so they never touch the network. The category tree and the tags come from
+ResponseCache and the task IDs from the event-id cache written by `showtask`. A completer stops with whatever
+it has found once COMPLETION_TIME_BUDGET is spent.
+
+When a cached response is missing or stale, the completer still answers from what it has and starts a detached
+`python -m girok.utils.completion`, which fetches it again for the next TAB press.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from girok.api.response_cache import ResponseCache
+from girok.config.config_store import ConfigStore
+from girok.constants import (
+    APP_DIR,
+    COMPLETION_MAX_BODY_SIZE,
+    COMPLETION_REFRESH_COOLDOWN,
+    COMPLETION_REFRESH_STAMP_PATH,
+    COMPLETION_TIME_BUDGET,
+    EVENT_IDS_CACHE_PATH,
+)
+from girok.utils.json_utils import read_json
+
+
+def complete_category_path(incomplete: str) -> List[str]:
+    deadline = time.monotonic() + COMPLETION_TIME_BUDGET
+    body = load_cached_body("categories")
+    if body is None:
+        return []
+
+    completions = []
+    for path in iter_category_paths(body.get("rootCategories", [])):
+        if time.monotonic() > deadline:
+            break
+        if path.startswith(incomplete):
+            completions.append(path)
+    return completions
+
+
+def complete_tag(incomplete: str) -> List[str]:
+    """Complete the last tag of a comma-separated list such as 'A,B,C'."""
+    body = load_cached_body("tags")
+    if body is None:
+        return []
+
+    head, _, current = incomplete.rpartition(",")
+    chosen_tags = set(head.split(",")) if head else set()
+    prefix = f"{head}," if head else ""
+    return [prefix + tag for tag in body.get("tags", []) if tag.startswith(current) and tag not in chosen_tags]
+
+
+def complete_task_id(incomplete: str) -> List[Tuple[str, str]]:
+    """Task IDs of the last `showtask`, with task names as help. The cache is never refreshed in the background,
+    since a refresh would renumber the IDs the user is looking at."""
+    try:
+        event_ids_cache = read_json(EVENT_IDS_CACHE_PATH)
+    except (OSError, ValueError):
+        return []
+
+    task_ids = sorted(event_ids_cache, key=lambda task_id: int(task_id))
+    return [(task_id, event_ids_cache[task_id]["name"]) for task_id in task_ids if task_id.startswith(incomplete)]
+
+
+def iter_category_paths(categories: list) -> Iterator[str]:
+    stack = [(category, "") for category in reversed(categories)]
+    while stack:
+        category, parent_path = stack.pop()
+        path = f"{parent_path}{category['name']}"
+        yield path
+        stack.extend((child, f"{path}/") for child in reversed(category.get("children", [])))
+
+
+def load_cached_body(endpoint: str) -> Optional[dict]:
+    entry = ResponseCache.get(endpoint)
+    if entry is None or not ResponseCache.is_fresh(entry):
+        schedule_refresh()
+    if entry is None:
+        return None
+
+    try:
+        if os.path.getsize(entry.body_path) > COMPLETION_MAX_BODY_SIZE:
+            return None
+        return json.loads(entry.read_body())
+    except (OSError, ValueError):
+        return None
+
+
+def schedule_refresh() -> None:
+    """Start a detached refresh, at most once every COMPLETION_REFRESH_COOLDOWN seconds."""
+    # Not logged in
+    if ConfigStore.get("access_token") is None:
+        return
+
+    try:
+        if time.time() - os.path.getmtime(COMPLETION_REFRESH_STAMP_PATH) < COMPLETION_REFRESH_COOLDOWN:
+            return
+    except OSError:
+        pass
+
+    try:
+        os.makedirs(APP_DIR, exist_ok=True)
+        with open(COMPLETION_REFRESH_STAMP_PATH, "w"):
+            pass
+        subprocess.Popen(
+            [sys.executable, "-m", "girok.utils.completion"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def refresh() -> None:
+    import girok.api.category as category_api
+    import girok.api.task as task_api
+
+    category_api.get_all_categories()
+    task_api.get_all_tags()
+
+
+if __name__ == "__main__":
+    refresh()
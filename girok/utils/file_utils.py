@@ -0,0 +1,60 @@
+import contextlib
+import os
+import tempfile
+import time
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path` across processes and threads.
+
+    The lock is taken on a sidecar '<path>.lock' file, since `path` itself gets replaced by `atomic_write`.
+    It is not reentrant: don't take the lock of a path twice in the same call stack.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Write `data` to a temporary file next to `path` and rename it over `path`.
+
+    Readers see either the old or the new content, never a partially written file.
+    """
+    dir_name, file_name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name or ".", prefix=f".{file_name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
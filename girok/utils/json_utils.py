@@ -1,20 +1,150 @@
+import codecs
 import json
 import os
+from typing import Any, Callable, Iterable, Iterator
+
+from girok.utils.file_utils import atomic_write, file_lock
+
+NUMBER_CHARS = frozenset("0123456789+-.eE")
 
 
 def read_json(path: str) -> dict:
+    # Writers replace files atomically, so a reader never sees a partially written file
     with open(path) as f:
         data = json.load(f)
         return data
 
 
 def write_json(path: str, data: dict):
-    with open(path, "w") as f:
-        json.dump(data, f)
+    with file_lock(path):
+        replace_json(path, data)
 
 
 def update_json(path: str, data: dict):
-    with open(path) as f:
-        org_data = json.load(f)
-        org_data.update(**data)
-    write_json(path, org_data)
+    modify_json(path, lambda org_data: {**org_data, **data})
+
+
+def modify_json(path: str, modify: Callable[[dict], dict]) -> dict:
+    """Read-modify-write a JSON file while holding its lock, so that concurrent girok processes don't
+    overwrite each other's changes. A missing file is read as {}.
+
+    Args:
+        path (str): Path of the JSON file.
+        modify (Callable[[dict], dict]): Receives the current content and returns the new one.
+
+    Returns:
+        dict: The new content.
+    """
+    with file_lock(path):
+        try:
+            org_data = read_json(path)
+        except FileNotFoundError:
+            org_data = {}
+        data = modify(org_data)
+        replace_json(path, data)
+        return data
+
+
+def replace_json(path: str, data: dict):
+    """Atomically replace the file. The caller is responsible for holding the file's lock."""
+    atomic_write(path, json.dumps(data).encode())
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Incrementally decode the items of the array stored under `key` of a top-level JSON object.
+
+    Only the item being decoded is held in memory, e.g. `{"events": [{...}, {...}]}` is yielded event by event
+    while its body is still being received. Values under other keys are decoded and skipped.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded JSON document split into arbitrary chunks.
+        key (str): Key of the top-level array to iterate over.
+
+    Yields:
+        Any: Decoded array items.
+    """
+    reader = JSONStreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        current_key = reader.read_value()
+        reader.expect(":")
+        if current_key != key:
+            reader.read_value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.read_value()
+                if reader.next_token(",]") == "]":
+                    return
+
+        if reader.next_token(",}") == "}":
+            return
+
+
+class JSONStreamReader:
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next chunk into the buffer. Returns False at the end of the stream."""
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            self.buf = self.buf[self.pos :] + self.decoder.decode(b"", final=True)
+            self.pos = 0
+            return False
+        self.buf = self.buf[self.pos :] + self.decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, token: str) -> None:
+        self.next_token(token)
+
+    def next_token(self, tokens: str) -> str:
+        token = self.peek()
+        if token not in tokens:
+            raise ValueError(f"Expected one of '{tokens}' but got '{token}' in JSON stream")
+        self.pos += 1
+        return token
+
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+
+            # A number may continue in the next chunk ('1' + '2', '1.' + '5', '1e' + '3'), so it is only complete
+            # once something else follows it or the stream has ended
+            is_number = self.buf[self.pos] in NUMBER_CHARS
+            if is_number and not self.eof and (end == len(self.buf) or self.buf[end] in NUMBER_CHARS):
+                self.fill()
+                continue
+
+            self.pos = end
+            return value
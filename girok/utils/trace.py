@@ -0,0 +1,181 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from girok.constants import TABLE_HEADER_TEXT_COLOR
+
+
+@dataclass
+class Span:
+    kind: str  # 'api' or 'stage'
+    name: str
+    start: float
+    duration: float = 0.0
+    phases: dict = field(default_factory=dict)
+    attrs: dict = field(default_factory=dict)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "start_ms": round(self.start * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "phases_ms": {k: round(v * 1000, 3) for k, v in self.phases.items()},
+            "attrs": self.attrs,
+        }
+
+
+class NullSpan:
+    """Stands in for a Span while tracing is off, so that call sites don't need to check. NULL_SPAN is shared by
+    every caller, so `phases` and `attrs` hand out a new empty dict on each access and writes to them are dropped."""
+
+    @property
+    def phases(self) -> dict:
+        return {}
+
+    @property
+    def attrs(self) -> dict:
+        return {}
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        pass
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """Collects timing spans of API calls and local stages for the `--trace` option.
+
+    Spans start relative to `origin`, which is reset by `enable()`. Nested spans are not modelled: an API call
+    made during a stage is recorded as its own span that overlaps the stage.
+    """
+
+    enabled: bool = False
+    origin: float = time.perf_counter()
+    spans: List[Span] = []
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def enable(cls) -> None:
+        cls.enabled = True
+        cls.origin = time.perf_counter()
+        cls.spans = []
+
+    @classmethod
+    @contextlib.contextmanager
+    def span(cls, kind: str, name: str, **attrs) -> Iterator[Span]:
+        if not cls.enabled:
+            yield NULL_SPAN
+            return
+
+        start = time.perf_counter()
+        span = Span(kind=kind, name=name, start=start - cls.origin, attrs=attrs)
+        parent = getattr(cls._local, "span", None)
+        cls._local.span = span
+        try:
+            yield span
+        finally:
+            cls._local.span = parent
+            span.duration = time.perf_counter() - start
+            with cls._lock:
+                cls.spans.append(span)
+
+    @classmethod
+    def stage(cls, name: str, **attrs):
+        """Time a local stage, e.g. `with Tracer.stage("render"): ...`."""
+        return cls.span("stage", name, **attrs)
+
+    @classmethod
+    def current_span(cls):
+        if not cls.enabled:
+            return NULL_SPAN
+        return getattr(cls._local, "span", None) or NULL_SPAN
+
+    @classmethod
+    def report(cls) -> None:
+        from rich import box
+        from rich.console import Console
+        from rich.style import Style
+        from rich.table import Column, Table
+
+        console = Console(stderr=True)
+        table = Table(
+            Column("Start", justify="right"),
+            Column("Kind"),
+            Column("Name"),
+            Column("Status", justify="center"),
+            Column("Bytes", justify="right"),
+            Column("Cache", justify="center"),
+            Column("Total", justify="right"),
+            Column("Phases"),
+            title="Trace",
+            box=box.SIMPLE_HEAD,
+            header_style=Style(color=TABLE_HEADER_TEXT_COLOR),
+        )
+        for span in sorted(cls.spans, key=lambda s: s.start):
+            attrs = span.attrs
+            phases = "  ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in span.phases.items())
+            table.add_row(
+                f"{span.start * 1000:.1f}",
+                span.kind,
+                span.name,
+                str(attrs.get("status", "")),
+                str(attrs.get("bytes", "")),
+                attrs.get("cache", ""),
+                f"{span.duration * 1000:.1f}",
+                phases,
+            )
+        console.print(table)
+        console.print("All times are in ms.", style=Style(dim=True))
+
+    @classmethod
+    def dump(cls, path: str) -> None:
+        data = {
+            "pid": os.getpid(),
+            "spans": [span.to_dict() for span in sorted(cls.spans, key=lambda s: s.start)],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def traced_stage(name: str) -> Callable:
+    """Decorator recording every call of the function as a stage."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Tracer.stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def finish_trace(print_report: bool, trace_file: Optional[str]) -> None:
+    if print_report:
+        Tracer.report()
+    if trace_file:
+        Tracer.dump(trace_file)
@@ -0,0 +1,68 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import girok.api_client as api_client
+from girok.api.entity import RequestPolicy, StreamError
+from girok.api_client import CONNECTION_ERROR_MESSAGE, TIMEOUT_ERROR_MESSAGE, APIClient
+from girok.config.auth_handler import AuthHandler
+
+PARTIAL_BODY = b'{"events": [{"id": 1}, {"id": 2}, {"id'
+
+
+class PartialBodyServer:
+    """Answers every request with the headers and part of the body, then closes the connection or stalls."""
+
+    def __init__(self, stall: bool):
+        self.stall = stall
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen()
+        self.stopped = threading.Event()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.listener.getsockname()[1]}/"
+
+    def serve(self) -> None:
+        conn, _ = self.listener.accept()
+        with conn:
+            conn.recv(65536)
+            headers = f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {10 * len(PARTIAL_BODY)}"
+            conn.sendall(headers.encode() + b"\r\n\r\n" + PARTIAL_BODY)
+            if self.stall:
+                self.stopped.wait(5)
+
+    def close(self) -> None:
+        self.stopped.set()
+        self.listener.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(AuthHandler, "get_access_token", classmethod(lambda cls: "token"))
+    monkeypatch.setattr(APIClient, "policy", RequestPolicy(connect_timeout=1, read_timeout=0.5, max_retries=0))
+    APIClient.close()
+    yield APIClient
+    APIClient.close()
+
+
+@pytest.mark.parametrize("stall, message", [(False, CONNECTION_ERROR_MESSAGE), (True, TIMEOUT_ERROR_MESSAGE)])
+def test_stream_cut_off_halfway_raises_stream_error(client, monkeypatch, stall, message):
+    server = PartialBodyServer(stall=stall)
+    monkeypatch.setattr(api_client, "BASE_URL", server.url)
+    try:
+        resp = client.get_stream("events", "events")
+        assert resp.is_success
+
+        started_at = time.monotonic()
+        with pytest.raises(StreamError) as exc_info:
+            list(resp.body["events"])
+    finally:
+        server.close()
+
+    assert str(exc_info.value) == message
+    assert time.monotonic() - started_at < 3
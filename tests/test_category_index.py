@@ -0,0 +1,57 @@
+import json
+import time
+
+import pytest
+
+from girok.api.category_index import CategoryIndex
+from girok.api.response_cache import CacheEntry, ResponseCache
+from girok.constants import CATEGORY_INDEX_MAX_AGE
+
+CATEGORIES = {
+    "rootCategories": [
+        {
+            "id": 1,
+            "name": "Work",
+            "color": "GREY",
+            "children": [{"id": 2, "name": "Reports", "color": "GREY", "children": []}],
+        }
+    ]
+}
+
+
+@pytest.fixture
+def cache_categories(tmp_path, monkeypatch):
+    """Serve `GET categories` from a cached entry stored `age` seconds ago."""
+
+    def cache(age: float) -> None:
+        body_path = tmp_path / "categories.body"
+        body_path.write_text(json.dumps(CATEGORIES))
+        entry = CacheEntry("categories", None, None, None, time.time() - age, str(body_path))
+        monkeypatch.setattr(ResponseCache, "get", classmethod(lambda cls, endpoint, params=None: entry))
+
+    monkeypatch.setattr(CategoryIndex, "_stamp", None)
+    monkeypatch.setattr(ResponseCache, "bypass", False)
+    return cache
+
+
+def test_lookup_uses_tree_past_response_cache_ttl(cache_categories):
+    cache_categories(ResponseCache.ttl + 1)
+
+    assert CategoryIndex.is_available()
+    assert CategoryIndex.lookup(["Work", "Reports"]) == 2
+    assert CategoryIndex.lookup(["Work", "Nope"]) is None
+
+
+def test_lookup_ignores_tree_older_than_max_age(cache_categories):
+    cache_categories(CATEGORY_INDEX_MAX_AGE + 1)
+
+    assert not CategoryIndex.is_available()
+    assert CategoryIndex.lookup(["Work"]) is None
+
+
+def test_lookup_ignores_tree_under_bypass(cache_categories, monkeypatch):
+    cache_categories(0)
+    monkeypatch.setattr(ResponseCache, "bypass", True)
+
+    assert not CategoryIndex.is_available()
+    assert CategoryIndex.lookup(["Work"]) is None
@@ -0,0 +1,107 @@
+import copy
+
+import pytest
+
+from girok.api.category_tree import (
+    add_category_node,
+    find_category,
+    move_category_node,
+    remove_category_node,
+    update_category_node,
+)
+
+
+def node(category_id: int, name: str, color: str, children: tuple = ()) -> dict:
+    return {"id": category_id, "name": name, "color": color, "children": list(children)}
+
+
+@pytest.fixture
+def root_categories() -> list:
+    return [
+        node(1, "Work", "GREY", [node(2, "Reports", "GREY", [node(3, "Q1", "GREY")])]),
+        node(4, "Home", "MINT", [node(5, "Chores", "MINT")]),
+    ]
+
+
+def test_add_top_level_category_takes_given_color(root_categories):
+    assert add_category_node(6, ["School"], "PINK")(root_categories)
+
+    assert find_category(root_categories, ["School"]) == node(6, "School", "PINK")
+
+
+def test_add_subcategory_takes_top_level_color(root_categories):
+    assert add_category_node(6, ["Work", "Reports", "Q2"], None)(root_categories)
+
+    assert find_category(root_categories, ["Work", "Reports", "Q2"]) == node(6, "Q2", "GREY")
+
+
+@pytest.mark.parametrize(
+    "path_list, color",
+    [
+        (["Work", "Reports"], None),  # already exists
+        (["Nope", "Q2"], None),  # missing parent
+        (["School"], None),  # top-level category without a color
+    ],
+)
+def test_add_does_nothing_when_it_cannot_apply(root_categories, path_list, color):
+    before = copy.deepcopy(root_categories)
+
+    assert not add_category_node(6, path_list, color)(root_categories)
+    assert root_categories == before
+
+
+def test_remove_category_with_its_subcategories(root_categories):
+    assert remove_category_node(["Work", "Reports"])(root_categories)
+
+    assert find_category(root_categories, ["Work"])["children"] == []
+    assert not remove_category_node(["Work", "Reports"])(root_categories)
+
+
+def test_update_name_and_recolor_descendants(root_categories):
+    assert update_category_node(["Work"], "Job", "PINK")(root_categories)
+
+    assert find_category(root_categories, ["Work"]) is None
+    assert find_category(root_categories, ["Job", "Reports", "Q1"])["color"] == "PINK"
+
+
+def test_update_refuses_name_taken_by_sibling(root_categories):
+    before = copy.deepcopy(root_categories)
+
+    assert not update_category_node(["Work"], "Home", None)(root_categories)
+    assert root_categories == before
+
+
+def test_update_to_own_name_is_allowed(root_categories):
+    assert update_category_node(["Work"], "Work", None)(root_categories)
+
+
+def test_move_takes_color_of_new_top_level_category(root_categories):
+    assert move_category_node(["Work", "Reports"], ["Home", "Chores"])(root_categories)
+
+    assert find_category(root_categories, ["Work", "Reports"]) is None
+    moved = find_category(root_categories, ["Home", "Chores", "Reports"])
+    assert moved["id"] == 2
+    assert moved["color"] == "MINT"
+    assert moved["children"][0]["color"] == "MINT"
+
+
+def test_move_to_top_level_keeps_color(root_categories):
+    assert move_category_node(["Home", "Chores"], [])(root_categories)
+
+    assert find_category(root_categories, ["Chores"]) == node(5, "Chores", "MINT")
+
+
+@pytest.mark.parametrize(
+    "path_list, new_parent_path_list",
+    [
+        (["Work"], ["Work", "Reports"]),  # under itself
+        (["Work", "Reports"], ["Nope"]),  # missing new parent
+        (["Work", "Nope"], ["Home"]),  # missing category
+        (["Home", "Chores"], ["Home"]),  # name taken in the new parent
+    ],
+)
+def test_move_does_nothing_when_it_cannot_apply(root_categories, path_list, new_parent_path_list):
+    before = copy.deepcopy(root_categories)
+
+    assert not move_category_node(path_list, new_parent_path_list)(root_categories)
+    assert root_categories == before
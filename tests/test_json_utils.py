@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from girok.utils.json_utils import iter_json_array
+
+
+def split_every(data: bytes, size: int) -> list:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"events": [1.5, 2, -3e10, 4.25e-3, 0, 123456789]},
+        {"total": 12.5, "flag": True, "none": None, "events": [{"id": 1, "name": "a,b]"}, {"id": 2}], "after": 1e3},
+        {"events": []},
+        {"events": ["é中", {"nested": [1, [2, 3]]}, False, None]},
+    ],
+)
+def test_items_survive_every_chunk_boundary(document):
+    data = json.dumps(document).encode()
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_array(split_every(data, size), "events")) == document["events"]
+
+
+def test_number_split_after_dot_or_exponent():
+    assert list(iter_json_array([b'{"events": [1.', b"5, 2]}"], "events")) == [1.5, 2]
+    assert list(iter_json_array([b'{"events": [1e', b"3, 2E+", b"2]}"], "events")) == [1e3, 2e2]
+    assert list(iter_json_array([b'{"skipped": 4.', b'0, "events": [7]}'], "events")) == [7]
+
+
+def test_number_at_end_of_stream_is_complete():
+    assert list(iter_json_array([b'{"events": [1]', b', "count": 12', b"}"], "events")) == [1]
+
+
+def test_missing_key_yields_nothing():
+    assert list(iter_json_array([b'{"other": [1, 2]}'], "events")) == []
+    assert list(iter_json_array([b"{}"], "events")) == []
+
+
+@pytest.mark.parametrize("data", [b'{"events": [1, 2', b'{"events": [1.]}', b'{"events": [1 2]}'])
+def test_malformed_documents_raise(data):
+    with pytest.raises(ValueError):
+        list(iter_json_array(split_every(data, 3), "events"))
@@ -0,0 +1,88 @@
+import pytest
+
+import girok.api.rate_limiter as rate_limiter
+from girok.api.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic / time.sleep, so that waiting takes no real time. Tests use rates that are
+    powers of two, so that refill arithmetic is exact and a wait always ends with a whole token."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=5)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=5, capacity=0.5)
+
+
+def test_burst_then_refill_rate(clock):
+    bucket = TokenBucket(rate=8, capacity=3)
+
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [0.125]
+
+
+def test_tokens_never_exceed_capacity(clock):
+    bucket = TokenBucket(rate=8, capacity=2)
+    clock.now += 60
+
+    bucket.acquire()
+    bucket.acquire()
+    bucket.acquire()
+
+    assert len(clock.sleeps) == 1
+
+
+def test_throttling_halves_rate_down_to_min_rate_and_drops_burst(clock):
+    bucket = TokenBucket(rate=8, capacity=5, min_rate=3, rate_step=1)
+
+    bucket.observe(429)
+    assert bucket.rate == 4
+    assert bucket.tokens == 0
+
+    bucket.observe(503)
+    assert bucket.rate == 3
+
+
+def test_success_restores_rate_up_to_initial_rate(clock):
+    bucket = TokenBucket(rate=8, capacity=5, min_rate=1, rate_step=3)
+    bucket.observe(429)
+
+    bucket.observe(200)
+    assert bucket.rate == 7
+    bucket.observe(200)
+    assert bucket.rate == 8
+
+
+def test_retry_after_pauses_the_bucket(clock):
+    bucket = TokenBucket(rate=64, capacity=5)
+    bucket.observe(429, retry_after=2)
+
+    bucket.acquire()
+
+    assert sum(clock.sleeps) >= 2
+    assert clock.now >= 102
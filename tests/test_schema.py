@@ -0,0 +1,119 @@
+import pytest
+
+from girok.api.entity import APIResponse, CategoryNode
+from girok.api.schema import CATEGORIES_BODY, EVENT, Field, ListOf, Schema, SchemaError, decode_body
+from girok.commands.task.entity import Event
+
+
+def build_event_json(**overrides) -> dict:
+    event = {
+        "id": 1,
+        "name": "Submit report",
+        "color": "GREYISH_GREEN",
+        "tags": ["work"],
+        "priority": "HIGH",
+        "memo": None,
+        "eventDate": {"startDate": "2026-10-20", "startTime": "09:00", "endDate": None, "endTime": None},
+        "repetition": {"repetitionType": None, "repetitionEndDate": None},
+        "categoryPath": [{"categoryId": 3, "categoryName": "Work"}],
+    }
+    event.update(overrides)
+    return event
+
+
+def test_decode_event():
+    event = EVENT.decode(build_event_json())
+
+    assert isinstance(event, Event)
+    assert event.name == "Submit report"
+    assert event.event_date.start_time == "09:00"
+    assert event.event_date.end_date is None
+    assert [(c.id, c.name) for c in event.category_path] == [(3, "Work")]
+    assert event.color_hex.startswith("#")
+
+
+@pytest.mark.parametrize(
+    "overrides, path, reason",
+    [
+        ({"id": "1"}, "id", "expected int, got str"),
+        ({"tags": "work"}, "tags", "expected list, got str"),
+        ({"tags": ["work", 2]}, "tags", "expected list of str, got int"),
+        ({"color": "PLAID"}, "color", "unexpected value 'PLAID'"),
+        ({"memo": 3}, "memo", "expected str, got int"),
+        ({"name": None}, "name", "expected str, got NoneType"),
+        ({"eventDate": {"startTime": None, "endDate": None, "endTime": None}}, "eventDate.startDate", "missing"),
+        ({"categoryPath": [{"categoryId": 3}]}, "categoryPath[0].categoryName", "missing"),
+    ],
+)
+def test_decode_event_reports_path_of_invalid_field(overrides, path, reason):
+    with pytest.raises(SchemaError) as exc_info:
+        EVENT.decode(build_event_json(**overrides))
+
+    assert exc_info.value.path == path
+    assert exc_info.value.reason == reason
+
+
+def test_decode_rejects_non_object():
+    with pytest.raises(SchemaError, match="expected Event object, got list"):
+        EVENT.decode([])
+
+
+def test_decode_list_and_iter_decode_prefix_index_of_invalid_item():
+    items = [build_event_json(), build_event_json(id=None)]
+
+    with pytest.raises(SchemaError) as exc_info:
+        EVENT.decode_list(items)
+    assert exc_info.value.path == "[1].id"
+
+    decoded = EVENT.iter_decode(items)
+    assert next(decoded).id == 1
+    with pytest.raises(SchemaError) as exc_info:
+        next(decoded)
+    assert exc_info.value.path == "[1].id"
+
+
+def test_decode_recursive_category_tree():
+    body = {
+        "rootCategories": [
+            {
+                "id": 1,
+                "name": "Work",
+                "color": "GREY",
+                "children": [{"id": 2, "name": "Reports", "color": "GREY", "children": []}],
+            }
+        ]
+    }
+
+    root_categories = CATEGORIES_BODY.decode(body)["rootCategories"]
+
+    assert root_categories == [CategoryNode(1, "Work", "GREY", [CategoryNode(2, "Reports", "GREY", [])])]
+
+
+def test_decode_recursive_category_tree_reports_nested_path():
+    body = {"rootCategories": [{"id": 1, "name": "Work", "color": "GREY", "children": [{"id": 2}]}]}
+
+    with pytest.raises(SchemaError) as exc_info:
+        CATEGORIES_BODY.decode(body)
+
+    assert exc_info.value.path == "rootCategories[0].children[0].name"
+
+
+def test_dict_target_is_keyed_by_attr():
+    schema = Schema("pair", dict, [Field("left", "l", int), Field("right", "r", ListOf(str), nullable=True)])
+
+    assert schema.decode({"l": 1, "r": None}) == {"left": 1, "right": None}
+    assert schema.decode({"l": 1, "r": ["a"]}) == {"left": 1, "right": ["a"]}
+
+
+def test_decode_body_turns_schema_errors_into_failures():
+    schema = Schema("id", dict, [Field("id", "id", int)])
+
+    resp = decode_body(APIResponse(is_success=True, body={"id": 7}, retry_count=2), schema)
+    assert resp.is_success and resp.body == {"id": 7} and resp.retry_count == 2
+
+    resp = decode_body(APIResponse(is_success=True, body={"id": "7"}), schema)
+    assert not resp.is_success
+    assert resp.error_message == "Unexpected response from the server (id: expected int, got str)"
+
+    failure = APIResponse(is_success=False, error_message="Not found")
+    assert decode_body(failure, schema) is failure
@@ -0,0 +1,85 @@
+from datetime import date
+from typing import Optional
+
+import pytest
+
+from girok.commands.task.entity import Category, Event, EventDate, Repetition
+
+TODAY = date(2026, 10, 18)  # a Sunday
+
+
+def build_event(
+    start_date: str,
+    end_date: Optional[str] = None,
+    repetition_type: Optional[str] = None,
+    repetition_end_date: Optional[str] = None,
+) -> Event:
+    return Event(
+        id=1,
+        name="Task",
+        color_str="GREY",
+        tags=[],
+        priority=None,
+        memo=None,
+        event_date=EventDate(start_date=start_date, start_time=None, end_date=end_date, end_time=None),
+        repetition=Repetition(repetition_type=repetition_type, repetition_end_date=repetition_end_date),
+        category_path=[Category(id=1, name="Work")],
+    )
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, expected",
+    [
+        ("2026-10-01", None, date(2026, 10, 1)),
+        ("2026-10-01", "2026-10-25", date(2026, 10, 25)),
+        ("2026-12-24", None, date(2026, 12, 24)),
+    ],
+)
+def test_one_off_task_is_due_on_end_date_or_start_date(start_date, end_date, expected):
+    assert build_event(start_date, end_date).get_due_date(TODAY) == expected
+
+
+@pytest.mark.parametrize(
+    "repetition_type, start_date, expected",
+    [
+        ("DAILY", "2026-01-01", date(2026, 10, 18)),
+        ("WEEKLY", "2026-01-05", date(2026, 10, 19)),  # Mondays
+        ("WEEKLY", "2026-01-04", date(2026, 10, 18)),  # Sundays
+        ("MONTHLY", "2026-01-18", date(2026, 10, 18)),
+        ("MONTHLY", "2026-01-10", date(2026, 11, 10)),
+        ("MONTHLY", "2026-01-31", date(2026, 10, 31)),
+        ("YEARLY", "2020-03-01", date(2027, 3, 1)),
+        ("YEARLY", "2020-12-25", date(2026, 12, 25)),
+        ("DAILY", "2026-11-01", date(2026, 11, 1)),  # first occurrence still ahead
+    ],
+)
+def test_repeating_task_is_due_on_next_occurrence(repetition_type, start_date, expected):
+    assert build_event(start_date, repetition_type=repetition_type).get_due_date(TODAY) == expected
+
+
+def test_monthly_and_yearly_occurrences_are_clamped_to_end_of_month():
+    monthly = build_event("2026-01-31", repetition_type="MONTHLY")
+    assert monthly.get_due_date(date(2026, 2, 10)) == date(2026, 2, 28)
+    assert monthly.get_due_date(date(2026, 12, 31)) == date(2026, 12, 31)
+
+    leap_day = build_event("2024-02-29", repetition_type="YEARLY")
+    assert leap_day.get_due_date(date(2026, 1, 1)) == date(2026, 2, 28)
+    assert leap_day.get_due_date(date(2027, 12, 1)) == date(2028, 2, 29)
+
+
+def test_monthly_occurrence_rolls_over_to_next_year():
+    assert build_event("2026-01-10", repetition_type="MONTHLY").get_due_date(date(2026, 12, 20)) == date(2027, 1, 10)
+
+
+def test_repeating_task_without_occurrence_left_has_no_due_date():
+    ended = build_event("2026-01-01", repetition_type="DAILY", repetition_end_date="2026-10-01")
+    assert ended.get_due_date(TODAY) is None
+
+    # Ends today, but the next Monday is after that
+    ending = build_event("2026-01-05", repetition_type="WEEKLY", repetition_end_date="2026-10-18")
+    assert ending.get_due_date(TODAY) is None
+
+
+def test_repeating_task_due_on_its_last_day():
+    event = build_event("2026-01-01", repetition_type="DAILY", repetition_end_date="2026-10-18")
+    assert event.get_due_date(TODAY) == TODAY
@@ -0,0 +1,28 @@
+from girok.utils.trace import NULL_SPAN, Tracer
+
+
+def test_null_span_drops_writes(monkeypatch):
+    monkeypatch.setattr(Tracer, "enabled", False)
+
+    with Tracer.span("api", "GET events") as span:
+        span.attrs["cache"] = "hit"
+        span.add_phase("wait", 1.0)
+
+    assert span is NULL_SPAN
+    assert NULL_SPAN.attrs == {}
+    assert NULL_SPAN.phases == {}
+    assert Tracer.current_span().attrs == {}
+
+
+def test_span_records_attrs_and_phases(monkeypatch):
+    monkeypatch.setattr(Tracer, "spans", [])
+    monkeypatch.setattr(Tracer, "enabled", True)
+
+    with Tracer.span("api", "GET events", method="GET") as span:
+        span.attrs["cache"] = "hit"
+        span.add_phase("wait", 0.25)
+        span.add_phase("wait", 0.25)
+
+    assert Tracer.spans == [span]
+    assert span.attrs == {"method": "GET", "cache": "hit"}
+    assert span.phases == {"wait": 0.5}